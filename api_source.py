@@ -1,56 +1,154 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from utils.parse_conf.planet_data_parser import PlanetParser
 from utils.parse_conf.major_order_parser import MajorOrderParser
 from utils.parse_conf.galaxy_stats_parser import parse_galaxy_stats
-from utils.parse_conf.data_fetcher import fetch_data_from_url
+from utils.parse_conf.data_fetcher import async_fetch_data_from_url, close_async_client, get_payload_hash
+from utils.parse_conf.refresh_engine import RefreshEngine
+from utils.parse_conf.response_cache import ResponseCache
+from utils.parse_conf.broadcaster import Broadcaster
+from utils.parse_conf.snapshot_store import SnapshotStore
+from utils.parse_conf.history_store import HistoryStore
+from utils.parse_conf.planet_projection import CampaignProjector
+from utils.parse_conf.static_resources import StaticResources
+from utils.parse_conf.shared_snapshot import SharedSnapshot
+from utils.parse_conf.poll_scheduler import AdaptivePollScheduler
+from utils.parse_conf import json_codec
 from conf import settings
-import json
-import os
+import asyncio
+import time
 
-def load_static_json_data(file_path):
-    base_path = os.path.dirname(os.path.abspath(__file__)) # Gets path of api_source's directory to add to full_path
-    full_path = os.path.join(base_path, 'resources', 'json', file_path)
-
-    # Value check before running code
-    if not os.path.exists(full_path):
-        print(f"Warning: Static JSON file not found at {full_path}")
-    
-    try:
-        # Open the rqeuested .json file
-        with open(full_path, 'r', encoding='utf-8') as f:
-            return json.load(f) # Fetch the data
-    except Exception as e:
-        print(f"Error loading {full_path}: {e}")
-        return {}
-    
 ######################################## 
 # LOAD IN STATIC DATA FROM json FOLDER #
 ########################################
-print("Loading static JSON data...")
-#PLANET DATA
-static_json_planets = load_static_json_data("planets/planets.json") # Holds planet name, sector, biome, environ, type, and weather_effects
-static_json_biomes = load_static_json_data("planets/biomes.json") # Gives biome description
-static_json_environmentals = load_static_json_data("planets/environmentals.json") # Gives environmental descriptions
-static_json_planet_effects = load_static_json_data("effects/planetEffects.json") # Contains IDs for planet effects
-static_json_campaign_types = load_static_json_data("campaign_types.json")
-static_json_factions = load_static_json_data("factions.json")
-# planetRegion needs to be fetched (cities are updated relatively frequently)
-#MO DATA
-static_json_task_type = load_static_json_data("assignments/tasks/task/type.json") # Major Order mission types
-static_json_task_valueTypes = load_static_json_data("assignments/tasks/task/valueTypes.json") # Same as above
-static_json_reward_types = load_static_json_data("assignments/reward/type.json")
-static_json_items = load_static_json_data("items/item_names.json")
-#WARBOND DATA (for later use)
-print("Static data loaded.")
+# Sections are decoded from the bundle the first time they're used
+static_resources = StaticResources(settings.static_resources["directory"], settings.static_resources["bundle_path"])
+
+
+# Last good snapshots on disk; workers serve these at boot while live data loads
+snapshot_store = SnapshotStore(settings.planet_snapshots["directory"])
+
+# Shared cache so upstream traffic doesn't scale with the number of viewers
+response_cache = ResponseCache()
+
+# Seed the cache from disk as already-expired entries: served as stale while the first refresh runs
+for cache_key in ("major_order", "war"):
+    stored = snapshot_store.load(cache_key)
+    if stored:
+        response_cache.set(cache_key, stored, ttl=0)
+
+# Keeps planet data live in the background; requests only ever read the latest snapshot
+refresh_engine = RefreshEngine(default_interval=settings.ahgs_api["time_delay"])
+
+# Poll intervals adapt to how often each endpoint's payload really changes
+poll_scheduler = AdaptivePollScheduler.from_settings({
+    "planets": settings.ahgs_api["time_delay"],
+    "major_order": settings.response_cache["major_order"]["ttl"],
+    "war": settings.response_cache["war"]["ttl"],
+})
+
+# With several uvicorn workers only the leader talks to upstream; the others read what it publishes.
+# With a dedicated poller (main_exe.py) deployed, no worker competes for the lock.
+shared_snapshot = SharedSnapshot(settings.shared_snapshot["directory"], can_lead=not settings.shared_snapshot["external_poller"])
+
+async def refresh_planets():
+    # Leader: refresh from upstream and publish. Followers get the leader's output from sync_planets.
+    if not shared_snapshot.try_lead():
+        return None
+    await asyncio.sleep(poll_scheduler.reserve("planets")) # Stay under the upstream rate limit
+    planet_handler.continue_from(shared_snapshot.generation("planets")) # Never number below a previous leader
+    started = time.monotonic()
+    planets = await planet_handler.refresh_async()
+    poll_scheduler.observe("planets", started)
+    snapshot = planet_handler.snapshot # Payloads and version from the same refresh
+    if snapshot.version > shared_snapshot.generation("planets"):
+        await asyncio.to_thread(
+            shared_snapshot.publish, "planets", snapshot.planets_json, snapshot.planets_json_gzip, generation=snapshot.version
+        )
+    return planets
+
+def sync_planets():
+    # Follower: adopt the leader's snapshot, decoding it once per generation
+    if shared_snapshot.is_leader:
+        return None
+    snapshot = shared_snapshot.read("planets")
+    if snapshot is None:
+        return None
+    generation, parts = snapshot
+    if len(parts) == 2 and planet_handler.load_shared(generation, *parts):
+        return planet_handler.combined_data
+    return None
+
+def publish_on_leader(cache_key, loader):
+    # Leader keeps a cached dataset fresh (and published) even when its own clients don't ask for it
+    async def job():
+        if shared_snapshot.try_lead():
+            value = await loader()
+            if value is not None:
+                # Fresh until the next scheduled poll, so requests don't trigger extra fetches in between
+                response_cache.set(cache_key, value, poll_scheduler.interval(cache_key) + 5)
+    return job
+
+# Live updates pushed to every /ws/updates subscriber
+broadcaster = Broadcaster()
+last_pushed_version = {"planets": 0}
+
+def push_planet_changes(_):
+    # One diff and one serialization per refresh, no matter how many viewers
+    since = last_pushed_version["planets"]
+    if planet_handler.version == since:
+        return
+
+    changes = planet_handler.get_changes_since(since)
+    last_pushed_version["planets"] = changes["version"]
+    if len(broadcaster):
+        message = json_codec.dumps({"type": "planets", "since": since, **changes}, non_str_keys=True).decode()
+        broadcaster.publish(message)
+
+last_recorded_version = {"planets": 0}
+
+def record_planet_history(planets):
+    # Only record new snapshots; a failed refresh hands back the previous one.
+    # Followers skip it, the leader records for everyone.
+    snapshot = planet_handler.snapshot
+    if planets is None or not shared_snapshot.is_leader or snapshot.version == last_recorded_version["planets"]:
+        return
+    last_recorded_version["planets"] = snapshot.version
+    asyncio.get_running_loop().run_in_executor(None, history_store.record, snapshot.planets)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refresh_engine.add_job("planets", refresh_planets, interval=lambda: poll_scheduler.interval("planets"))
+    refresh_engine.add_job("planets_sync", sync_planets, interval=settings.shared_snapshot["sync_interval"])
+    for cache_key, loader in (("major_order", load_major_orders), ("war", load_galaxy_stats)):
+        refresh_engine.add_job(cache_key, publish_on_leader(cache_key, loader), interval=lambda cache_key=cache_key: poll_scheduler.interval(cache_key))
+    last_pushed_version["planets"] = planet_handler.version
+    refresh_engine.add_listener("planets", push_planet_changes)
+    refresh_engine.add_listener("planets_sync", push_planet_changes)
+    last_recorded_version["planets"] = planet_handler.version # Snapshot loaded from disk was recorded by the previous run
+    refresh_engine.add_listener("planets", record_planet_history)
+    refresh_engine.start()
+    yield
+    await refresh_engine.stop()
+    shared_snapshot.release()
+    await close_async_client()
+    history_store.close()
+
+
+class CodecJSONResponse(JSONResponse):
+    # Endpoint return values are encoded by json_codec like every other payload
+    def render(self, content) -> bytes:
+        return json_codec.dumps(content, non_str_keys=True)
 
 
 # Initiation for FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=CodecJSONResponse)
 
 # Defining which origins are allowed to make requests 
 # Works with the CORS FastAPI
@@ -70,23 +168,35 @@ app.add_middleware(
     allow_headers=["*"]  # All headers
 )
 
+# Planet time series for trends (liberation rate, player movement)
+history_store = HistoryStore(
+    settings.planet_history["path"],
+    raw_retention_hours=settings.planet_history["raw_retention_hours"],
+    hourly_retention_days=settings.planet_history["hourly_retention_days"],
+)
+
+# Liberation ETA / defense outcome for every active campaign, computed once per refresh
+projector = CampaignProjector()
+
 planet_handler = PlanetParser(
-    static_json_planets=static_json_planets,
-    static_json_biomes=static_json_biomes,
-    static_json_environmentals=static_json_environmentals,
-    static_json_planet_effects=static_json_planet_effects,
-    static_json_factions=static_json_factions,
-    static_json_campaign_types=static_json_campaign_types
+    static_resources=static_resources, # Reads only the sections it uses
+    snapshot_store=snapshot_store,
+    projector=projector,
+    fetch_on_init=False # The refresh engine fetches live data once the app is up
 )
 
+# Pick up campaign trends where the last run left off
+projection_start = time.time() - projector.window_seconds
+projector.seed(planet_handler.combined_data, {
+    index: [(sample["timestamp"], sample["currentHealth"]) for sample in history_store.query(index, projection_start, resolution="raw")]
+    for index, planet in planet_handler.combined_data.items()
+    if CampaignProjector.is_campaign(planet)
+})
+
 mo_handler = MajorOrderParser(
     planet_parser=planet_handler,
-    user_timezone="UTC",
-    task_types_map=static_json_task_type,
-    reward_types_map=static_json_reward_types,
-    value_types_map=static_json_task_valueTypes,
-    item_names_map=static_json_items,
-    factions_map=static_json_factions
+    static_resources=static_resources,
+    user_timezone=settings.major_orders["timezone"],
 )
 
 """
@@ -94,44 +204,158 @@ mo_handler = MajorOrderParser(
 """
 
 @app.get("/")
-def get_root():
+async def get_root():
     print("If you are reading this message, the Helldivers 2 API is running." \
     "\nGo to /api/planets, /api/major_orders, or /api/galaxy_stats to access data.") 
 
 
 # All planet data combined
 @app.get("/api/planets") 
-def get_all_planets():
+async def get_all_planets(request: Request):
     print("Request received for all planet data...")
-    return planet_handler.get_all_planets()
+    # Serialized once per refresh; pick the gzip copy when the client accepts it
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=planet_handler.get_all_planets_json(gzipped=True),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(
+        content=planet_handler.get_all_planets_json(),
+        media_type="application/json",
+        headers={"Vary": "Accept-Encoding"},
+    )
+
+# Only the planet fields that changed since a snapshot version
+@app.get("/api/planets/changes")
+async def get_planet_changes(since: int = 0):
+    return planet_handler.get_changes_since(since)
+
+# Planet name search (prefix, then fuzzy); declared before /{planet_name} so it isn't swallowed by it
+@app.get("/api/planets/search")
+async def search_planets(q: str, limit: int = 10):
+    return planet_handler.search_planets(q, limit)
+
+# Push channel: planet deltas are sent as they're refreshed instead of clients polling
+@app.websocket("/ws/updates")
+async def updates_socket(websocket: WebSocket):
+    await websocket.accept()
+    queue = broadcaster.subscribe()
+    try:
+        # Clients catch up with /api/planets/changes?since=<version>, then apply pushed deltas
+        await websocket.send_text(json_codec.dumps({"type": "hello", "version": planet_handler.version}).decode())
+        while True:
+            message = await queue.get()
+            await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        broadcaster.unsubscribe(queue)
 
 # Specific planet data
 @app.get("/api/planets/{planet_name}")
-def get_single_planet(planet_name: str):
+async def get_single_planet(planet_name: str):
     print(f"Request received for planet {planet_name}...")
     planet = planet_handler.get_planet_by_name(planet_name)
-    return planet if planet else {"error": "Planet was not found"}
+    return planet.to_dict() if planet else {"error": "Planet was not found"}
+
+# Planet history over a time range (unix seconds); resolution is raw, hourly or auto
+@app.get("/api/planets/{planet_name}/history")
+async def get_planet_history(planet_name: str, start: float = None, end: float = None, resolution: str = "auto"):
+    planet = planet_handler.get_planet_by_name(planet_name)
+    if not planet:
+        return {"error": "Planet was not found"}
+    samples = await asyncio.to_thread(history_store.query, planet["index"], start, end, resolution)
+    return {"index": planet["index"], "name": planet["name"], "samples": samples}
+
+# Planet statistics summed galaxy-wide or per sector / owner / faction
+@app.get("/api/aggregates")
+async def get_aggregates(group_by: str = None):
+    try:
+        return planet_handler.get_aggregates(group_by)
+    except ValueError as e:
+        return {"error": str(e)}
+
+# Liberation ETA and defense success chance for every active campaign
+@app.get("/api/projections")
+async def get_projections():
+    # Read off the records so followers, whose projector never runs, answer the same
+    return {
+        index: {"name": planet.get("name"), **planet.projection}
+        for index, planet in planet_handler.get_all_planets().items()
+        if planet.projection
+    }
+
+# Supply line graph queries
+@app.get("/api/supply_lines/path")
+async def get_supply_path(source: str, target: str):
+    route = planet_handler.get_supply_path(source, target)
+    return route if route is not None else {"error": "Planet was not found"}
+
+@app.get("/api/supply_lines/frontline")
+async def get_frontline():
+    return planet_handler.get_frontline()
+
+@app.get("/api/supply_lines/reachable")
+async def get_reachable(origin: str = None):
+    reachable = planet_handler.get_reachable(origin)
+    return reachable if reachable is not None else {"error": "Planet was not found"}
+
+# Parsed major order / galaxy stats last written to disk and the shared snapshot
+last_saved = {}
+
+async def save_dataset(cache_key, value):
+    # Parsers hand back the very same object when upstream sent the same bytes; nothing to write then
+    if last_saved.get(cache_key) is value:
+        return
+    last_saved[cache_key] = value
+    await asyncio.to_thread(snapshot_store.save, cache_key, value)
+    await asyncio.to_thread(shared_snapshot.publish_json, cache_key, value)
 
 # Major order data
+async def load_major_orders():
+    if not shared_snapshot.try_lead():
+        return shared_snapshot.load("major_order")
+    major_order_url = settings.urls.get("major_order")
+    await asyncio.sleep(poll_scheduler.reserve("major_order"))
+    started = time.monotonic()
+    raw_data = await async_fetch_data_from_url(major_order_url)
+    poll_scheduler.observe("major_order", started)
+    if raw_data is not None:
+        parsed_orders = mo_handler.parse_major_order_data(raw_data, get_payload_hash(major_order_url, started))
+        if parsed_orders is not None:
+            await save_dataset("major_order", parsed_orders)
+        return parsed_orders
+    return None
+
 @app.get("/api/major_orders")
-def get_major_orders():
+async def get_major_orders():
     print("Request received for major orders...")
-    major_order_url = settings.urls.get("major_order")
-    raw_data = fetch_data_from_url(major_order_url)
-    if raw_data:
-        parsed_orders = mo_handler.parse_major_order_data(raw_data)
+    parsed_orders = await response_cache.aget("major_order", load_major_orders, **settings.response_cache["major_order"])
+    if parsed_orders is not None:
         return parsed_orders
     return {"error": "Failed to fetch major order data"}
 
 # Galaxy stats
-@app.get("/api/galaxy_stats")
-def get_galaxy_stats():
-    print("Request received for galaxy stats...")
-    print(f"Available keys in settings: {list(settings.urls.keys())}")
+async def load_galaxy_stats():
+    if not shared_snapshot.try_lead():
+        return shared_snapshot.load("war")
     galaxy_stats_url = settings.urls.get("war")
-    print(f"Trying to fetch URL: '{galaxy_stats_url}'")
-    raw_data = fetch_data_from_url(galaxy_stats_url)
+    await asyncio.sleep(poll_scheduler.reserve("war"))
+    started = time.monotonic()
+    raw_data = await async_fetch_data_from_url(galaxy_stats_url)
+    poll_scheduler.observe("war", started)
     if raw_data:
-        galaxy_stats = parse_galaxy_stats(raw_data) # returns a list
+        galaxy_stats = parse_galaxy_stats(raw_data, get_payload_hash(galaxy_stats_url, started))
+        if galaxy_stats:
+            await save_dataset("war", galaxy_stats)
+        return galaxy_stats
+    return None
+
+@app.get("/api/galaxy_stats")
+async def get_galaxy_stats():
+    print("Request received for galaxy stats...")
+    galaxy_stats = await response_cache.aget("war", load_galaxy_stats, **settings.response_cache["war"])
+    if galaxy_stats:
         return galaxy_stats
     return {"error": "Failed to fetch galaxy stats"}
\ No newline at end of file
@@ -0,0 +1,11 @@
+import os
+
+# Settings conf.settings requires at import; the benchmarks run offline, so placeholders will do
+REQUIRED_ENV = ("SECURITY_TOKEN", "SESSION_TOKEN", "BASE_URL", "WAR", "MAJOR_ORDER", "CAMPAIGNS",
+                "NEWS_FEED", "PLANETS", "PLANET_EVENTS", "STEAM_NEWS", "SPACE_STATIONS")
+
+
+def use_placeholder_env():
+    # Call before importing anything that loads conf.settings; real values already set are kept
+    for name in REQUIRED_ENV:
+        os.environ.setdefault(name, "")
@@ -0,0 +1,71 @@
+"""
+    Decoding upstream-shaped payloads the old way (requests'
+    response.json(): bytes -> str -> stdlib json) vs json_codec with
+    each backend straight from the bytes, and encoding a snapshot.
+
+    Run from the project root:
+        python -m benchmarks.bench_json_decode
+"""
+import timeit
+
+from benchmarks import use_placeholder_env
+
+use_placeholder_env() # Before anything that imports conf.settings
+
+import requests
+
+from benchmarks.bench_planet_stream import PLANETS, upstream_planet
+from utils.parse_conf import json_codec
+
+ROUNDS = 50
+
+
+def campaign(i):
+    # Shape of one /api/v1/campaigns entry
+    return {"id": 50000 + i, "planet": upstream_planet(i * 3), "type": 0, "count": i % 4, "faction": "Automaton"}
+
+
+def old_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response._content = body
+    response.encoding = "utf-8"
+    return response
+
+
+def best_ms(function) -> float:
+    return min(timeit.repeat(function, number=ROUNDS, repeat=5)) / ROUNDS * 1000
+
+
+def main():
+    initial_backend = json_codec.backend
+    payloads = {
+        "planets": json_codec.dumps([upstream_planet(i) for i in range(PLANETS)]),
+        "campaigns": json_codec.dumps([campaign(i) for i in range(40)]),
+    }
+
+    print(f"Decode, best of 5 x {ROUNDS} (ms per payload)")
+    for label, body in payloads.items():
+        response = old_response(body)
+        timings = {"response.json()": best_ms(response.json)}
+        for backend in json_codec.BACKENDS:
+            json_codec.use_backend(backend)
+            if json_codec.backend == backend: # orjson may not be installed
+                timings[f"json_codec ({backend})"] = best_ms(lambda: json_codec.loads(body))
+
+        print(f"  {label} ({len(body) / 1024:.0f} KiB)")
+        for name, ms in timings.items():
+            print(f"    {name + ':':22} {ms:6.3f} ms")
+
+    snapshot = {index: planet for index, planet in enumerate(json_codec.loads(payloads["planets"]))}
+    print("Encode the planets snapshot (int keys)")
+    for backend in json_codec.BACKENDS:
+        json_codec.use_backend(backend)
+        if json_codec.backend == backend:
+            ms = best_ms(lambda: json_codec.dumps(snapshot, non_str_keys=True))
+            print(f"    {f'json_codec ({backend}):':22} {ms:6.3f} ms")
+
+    json_codec.use_backend(initial_backend)
+
+
+if __name__ == "__main__":
+    main()
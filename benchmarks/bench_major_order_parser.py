@@ -0,0 +1,120 @@
+"""
+    Times MajorOrderParser.parse_major_order_data on synthetic orders:
+    a full parse with the value-type keys looked up per task (get_value_key
+    and int(), as before they were precomputed) and with the precomputed
+    keys, a re-parse where every order is unchanged, and a payload whose
+    hash matches the last parse.
+
+    Run from the project root:
+        python -m benchmarks.bench_major_order_parser
+"""
+import timeit
+
+from benchmarks import use_placeholder_env
+
+use_placeholder_env() # Before anything that imports conf.settings
+
+from utils.parse_conf.major_order_parser import MajorOrderParser
+
+ORDERS = 4
+TASKS_PER_ORDER = 8
+ROUNDS = 2000
+
+
+class _StubPlanetParser():
+    version = 1 # Snapshot never changes during the benchmark
+
+    def get_planet_name_by_id(self, planet_id):
+        return f"Planet {planet_id}"
+
+
+def _per_task_key(name):
+    # Value-type key resolved on every access, the way tasks did before __init__ precomputed them
+    def lookup(self):
+        key_str = self.reverse_value_map.get(name)
+        if key_str:
+            return int(key_str)
+        return None
+    return property(lookup, lambda self, value: None) # __init__'s precomputed value is ignored
+
+
+class _PerTaskLookupParser(MajorOrderParser):
+    goal_key = _per_task_key("goal")
+    planet_key = _per_task_key("locationIndex")
+    faction_key = _per_task_key("faction")
+    target_key = _per_task_key("targetID")
+    loc_type_key = _per_task_key("locationType")
+
+
+def build_orders():
+    task_types = ["3", "11", "12", "13"]
+    orders = []
+    for order_id in range(ORDERS):
+        tasks = []
+        for i in range(TASKS_PER_ORDER):
+            tasks.append({
+                "type": int(task_types[i % len(task_types)]),
+                "values": [3, 1, 100000, 0, 1, i],
+                "valueTypes": [1, 2, 3, 4, 11, 12],
+            })
+        orders.append({
+            "id32": order_id,
+            "progress": list(range(TASKS_PER_ORDER)),
+            "expiresIn": 86400,
+            "setting": {
+                "type": 4,
+                "overrideTitle": "MAJOR ORDER",
+                "overrideBrief": "Briefing",
+                "taskDescription": "Description",
+                "tasks": tasks,
+                "rewards": [{"type": 1, "amount": 50}],
+            },
+        })
+    return orders
+
+
+def new_parser(parser_class=MajorOrderParser):
+    return parser_class(
+        planet_parser=_StubPlanetParser(),
+        static_resources={
+            "task_types": {"3": "Eradicate", "11": "Liberate", "12": "Defense", "13": "Hold"},
+            "task_value_types": {"1": "faction", "2": "unknown", "3": "goal", "4": "targetID", "11": "locationType", "12": "locationIndex"},
+            "factions": {3: "Automaton"},
+        },
+    )
+
+
+def main():
+    parser = new_parser()
+    per_task_parser = new_parser(_PerTaskLookupParser)
+    orders = build_orders()
+
+    def full_parse(parser):
+        parser._parsed_orders = {} # Forget the previous parse so every order is parsed again
+        return parser.parse_major_order_data(orders)
+
+    # Silence the per-call "Successfully parsed" print while timing
+    import builtins
+    real_print = builtins.print
+    builtins.print = lambda *args, **kwargs: None
+    try:
+        if full_parse(per_task_parser) != full_parse(parser):
+            raise AssertionError("per-task lookups and precomputed keys parsed the orders differently")
+
+        timings = {
+            "full parse, per-task keys": min(timeit.repeat(lambda: full_parse(per_task_parser), number=ROUNDS, repeat=5)),
+            "full parse": min(timeit.repeat(lambda: full_parse(parser), number=ROUNDS, repeat=5)),
+            "unchanged orders": min(timeit.repeat(lambda: parser.parse_major_order_data(orders), number=ROUNDS, repeat=5)),
+            "same payload hash": min(timeit.repeat(lambda: parser.parse_major_order_data(orders, payload_hash="h"), number=ROUNDS, repeat=5)),
+        }
+    finally:
+        builtins.print = real_print
+
+    print(f"{ORDERS} orders x {TASKS_PER_ORDER} tasks, best of 5 x {ROUNDS} rounds")
+    for label, seconds in timings.items():
+        per_order_us = seconds / (ROUNDS * ORDERS) * 1e6
+        print(f"  {label + ':':27} {per_order_us:6.2f} us/order ({per_order_us / TASKS_PER_ORDER:.2f} us/task)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+    Memory footprint of a planet snapshot as 40-key dicts vs slotted
+    PlanetRecords (both with interned names), and the real cost of one
+    history sample in HistoryStore: bytes on disk and as query() rows.
+
+    Run from the project root:
+        python -m benchmarks.bench_planet_records
+"""
+import os
+import tempfile
+import tracemalloc
+
+from utils.parse_conf.history_store import HistoryStore
+from utils.parse_conf.planet_records import PlanetRecord, PlanetStatic, _intern
+
+PLANETS = 260
+
+
+def raw_planet(i, tick):
+    return {
+        "index": i, "name": f"Planet {i}", "sector": f"Sector {i % 40}", "type": "Planet",
+        "biomeName": "Desert Dunes", "biomeDescr": "A dry, sandy world.",
+        "hazards": [("Intense Heat", "Stamina drains faster."), ("Sandstorms", "Visibility is reduced.")],
+        "position": (i / PLANETS, -i / PLANETS), "waypoints": [(i + 1) % PLANETS, (i + 7) % PLANETS],
+        "players": (i * 37 + tick) % 5000, "health": 1000000 - (i * 1000 + tick) % 1000000,
+    }
+
+
+def as_dict(raw):
+    # Shape of the old combined_data entries, including stringified position/regen. Strings are
+    # interned like PlanetStatic.build does, so only the layout differs between the two sides.
+    return {
+        'index': raw["index"], 'name': _intern(f"Planet {raw['index']}"), 'sector': _intern(f"Sector {raw['index'] % 40}"), 'type': "Planet",
+        'biomeName': _intern(raw["biomeName"]), 'biomeDescr': _intern(raw["biomeDescr"]),
+        'hazardName': [_intern(name) for name, _ in raw["hazards"]], 'hazardDesc': [_intern(descr) for _, descr in raw["hazards"]],
+        'isUnderAttack': False, 'isDisabled': False, 'eventId': "", 'campaignId': "", 'campaignType': "",
+        'campaignTypeId': "", 'campaignCount': "", 'attackingFactionId': "", 'attackingFaction': "", 'attackingPlanet': "",
+        'missionsWon': 123456, 'missionsLost': 12345, 'missionTime': 9876543, 'bugKills': 1234567, 'botKills': 1234567,
+        'squidKills': 1234567, 'bulletsFired': 98765432, 'bulletsHit': 45678901, 'timePlayed': 9876543, 'deaths': 654321,
+        'friendlies': 4321, 'players': raw["players"], 'initialOwner': "Humans", 'owner': "Humans",
+        'currentHealth': raw["health"], 'regenPerSecond': str(1.5), 'maxHealth': 1000000, 'eventStartTime': "", 'eventEndTime': "",
+        'position': str({"x": raw["position"][0], "y": raw["position"][1]}),
+        'waypoints': list(raw["waypoints"]), 'waypointNames': [_intern(f"Planet {w}") for w in raw["waypoints"]],
+    }
+
+
+def as_record(raw, previous=None):
+    static = PlanetStatic.build(
+        index=raw["index"], name=f"Planet {raw['index']}", sector=f"Sector {raw['index'] % 40}", type="Planet",
+        biome_name=raw["biomeName"], biome_descr=raw["biomeDescr"], hazards=raw["hazards"], position=raw["position"],
+        waypoints=raw["waypoints"], waypoint_names=[f"Planet {w}" for w in raw["waypoints"]], initial_owner="Humans",
+    )
+    if previous is not None and previous.static == static:
+        static = previous.static
+    return PlanetRecord(
+        static=static, missions_won=123456, missions_lost=12345, mission_time=9876543, bug_kills=1234567,
+        bot_kills=1234567, squid_kills=1234567, bullets_fired=98765432, bullets_hit=45678901, time_played=9876543,
+        deaths=654321, friendlies=4321, players=raw["players"], owner="Humans", current_health=raw["health"],
+        regen_per_second=1.5, max_health=1000000,
+    )
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return result, size
+
+
+def main():
+    raws_1 = [raw_planet(i, 1) for i in range(PLANETS)]
+    raws_2 = [raw_planet(i, 2) for i in range(PLANETS)]
+
+    _, dict_size = measure(lambda: {raw["index"]: as_dict(raw) for raw in raws_1})
+    first, record_size = measure(lambda: {raw["index"]: as_record(raw) for raw in raws_1})
+    _, refresh_size = measure(lambda: {raw["index"]: as_record(raw, first[raw["index"]]) for raw in raws_2})
+
+    print(f"Snapshot of {PLANETS} planets")
+    print(f"  dicts:                       {dict_size / 1024:8.1f} KiB ({dict_size / PLANETS:.0f} B/planet)")
+    print(f"  records (first snapshot):    {record_size / 1024:8.1f} KiB ({record_size / PLANETS:.0f} B/planet)")
+    print(f"  records (statics reused):    {refresh_size / 1024:8.1f} KiB ({refresh_size / PLANETS:.0f} B/planet)")
+
+    refreshes = 60
+    disk_size, query_size = history_sample_cost(refreshes)
+    samples = refreshes * PLANETS
+    print(f"History sample (HistoryStore, {refreshes} refreshes x {PLANETS} planets)")
+    print(f"  on disk:          {disk_size / samples:6.1f} B/sample")
+    print(f"  query() results:  {query_size / samples:6.1f} B/sample")
+
+
+def history_sample_cost(refreshes):
+    # A snapshot of records and one of dicts give HistoryStore.record() the same rows,
+    # so this is the per-sample cost either way
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.sqlite3")
+        store = HistoryStore(path)
+        start = 1700000000
+        for tick in range(refreshes):
+            store.record({i: as_record(raw_planet(i, tick)) for i in range(PLANETS)}, timestamp=start + tick * 20)
+
+        store._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)") # Everything into the main file before measuring it
+        disk_size = os.path.getsize(path)
+        end = start + refreshes * 20
+        _, query_size = measure(lambda: [store.query(i, start, end, resolution="raw") for i in range(PLANETS)])
+        store.close()
+    return disk_size, query_size
+
+
+if __name__ == "__main__":
+    main()
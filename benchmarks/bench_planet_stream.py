@@ -0,0 +1,97 @@
+"""
+    Building a planet snapshot from a buffered, fully decoded planets
+    list vs streaming it element by element (iter_array_elements),
+    and streaming again when no planet changed. Reports time and the
+    peak memory allocated on top of the raw body.
+
+    Run from the project root:
+        python -m benchmarks.bench_planet_stream
+"""
+import time
+import tracemalloc
+
+from benchmarks import use_placeholder_env
+
+use_placeholder_env() # Before anything that imports conf.settings
+
+from utils.parse_conf import json_codec
+
+from utils.parse_conf.json_stream import iter_array_elements
+from utils.parse_conf.planet_data_parser import PlanetParser
+
+PLANETS = 260
+CHUNK_SIZE = 64 * 1024
+ROUNDS = 20
+
+
+def upstream_planet(i):
+    # Shape of one /api/v1/planets entry
+    return {
+        "index": i, "name": f"Planet {i}", "sector": f"Sector {i % 40}",
+        "biome": {"name": "Desert Dunes", "description": "A dry, sandy world."},
+        "hazards": [{"name": "Intense Heat", "description": "Stamina drains faster."}],
+        "hash": 123456789, "position": {"x": i / PLANETS, "y": -i / PLANETS},
+        "waypoints": [(i + 1) % PLANETS, (i + 7) % PLANETS], "maxHealth": 1000000,
+        "health": 1000000 - i * 1000, "disabled": False, "initialOwner": "Humans", "currentOwner": "Humans",
+        "regenPerSecond": 1.5, "event": None,
+        "statistics": {"missionsWon": 123456, "missionsLost": 12345, "missionTime": 9876543, "terminidKills": 1234567,
+                       "automatonKills": 1234567, "illuminateKills": 1234567, "bulletsFired": 98765432,
+                       "bulletsHit": 45678901, "timePlayed": 9876543, "deaths": 654321, "revives": 0,
+                       "friendlies": 4321, "missionSuccessRate": 90, "accuracy": 46, "playerCount": i * 37 % 5000},
+        "attacking": [],
+    }
+
+
+def new_parser():
+    return PlanetParser(static_resources={"planets": {}, "biomes": {}, "environmentals": {}}, fetch_on_init=False)
+
+
+def measure(build, prepare=None):
+    # Best time over ROUNDS fresh runs, and the peak allocated by one run
+    def ready_parser():
+        parser = new_parser()
+        if prepare:
+            prepare(parser)
+        return parser
+
+    best = float("inf")
+    for _ in range(ROUNDS):
+        parser = ready_parser()
+        started = time.perf_counter()
+        build(parser)
+        best = min(best, time.perf_counter() - started)
+
+    parser = ready_parser()
+    tracemalloc.start()
+    build(parser)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    body = json_codec.dumps([upstream_planet(i) for i in range(PLANETS)])
+    chunks = [body[offset:offset + CHUNK_SIZE] for offset in range(0, len(body), CHUNK_SIZE)]
+
+    def buffered(parser):
+        parser._combine(json_codec.loads(body), [], [])
+
+    def streamed(parser):
+        parser._combine(iter_array_elements(chunks), [], [])
+
+    def previous_snapshot(parser):
+        parser._publish(parser._combine(iter_array_elements(chunks), [], []))
+
+    timings = {
+        "buffered": measure(buffered),
+        "streamed": measure(streamed),
+        "streamed, unchanged": measure(streamed, prepare=previous_snapshot),
+    }
+
+    print(f"{PLANETS} planets, {len(body) / 1024:.0f} KiB body in {CHUNK_SIZE // 1024} KiB chunks, best of {ROUNDS}")
+    for label, (seconds, peak) in timings.items():
+        print(f"  {label + ':':21} {seconds * 1000:6.2f} ms, peak {peak / 1024:6.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
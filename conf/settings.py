@@ -27,6 +27,74 @@ ahgs_api = {
     "time_delay": int(20),
 }
 
+http_client = {
+    "connect_timeout": float(os.environ.get("CONNECT_TIMEOUT", 5)), # Seconds to establish a connection
+    "read_timeout": float(os.environ.get("READ_TIMEOUT", 10)), # Seconds to wait between bytes from upstream
+    "fan_out_deadline": float(os.environ.get("FAN_OUT_DEADLINE", 15)), # Deadline for a whole batch of concurrent fetches
+    "fan_out_workers": 8,
+    "pool_connections": 4, # Distinct upstream hosts kept alive
+    "pool_maxsize": 10, # Keep-alive connections per host
+    "max_retries": int(os.environ.get("MAX_RETRIES", 3)), # Retries on 429/5xx and connection errors
+    "backoff_factor": 0.5, # Sleeps 0.5s, 1s, 2s... between retries
+    "backoff_jitter": 0.5, # Up to 0.5s random jitter on top of each backoff
+    "backoff_max": 30, # Longest single backoff (seconds)
+    "stream_planets": os.environ.get("STREAM_PLANETS", "1") == "1", # Parse the planets list element by element while it downloads
+    "stream_chunk_size": 64 * 1024, # Bytes read from the socket at a time when streaming
+}
+
+planet_snapshots = {
+    "delta_history": int(os.environ.get("PLANET_DELTA_HISTORY", 90)), # Refreshes worth of per-planet changes kept for /api/planets/changes
+    "directory": os.environ.get("SNAPSHOT_DIR", str(Path(__file__).resolve().parent.parent / "data" / "snapshots")), # Last good snapshots for warm starts
+}
+
+# Adaptive polling: each endpoint's interval moves between its bounds with how often its payload actually changes.
+# "urls" are keys of `urls` below that the endpoint fetches together.
+poll_scheduler = {
+    "endpoints": {
+        "planets": {"urls": ["planets", "planet_events", "campaigns"], "min_interval": 10, "max_interval": 60},
+        "major_order": {"urls": ["major_order"], "min_interval": 30, "max_interval": 300},
+        "war": {"urls": ["war"], "min_interval": 10, "max_interval": 120},
+    },
+    "requests_per_minute": float(os.environ.get("UPSTREAM_REQUESTS_PER_MINUTE", 60)), # Shared by every endpoint
+    "burst": 10,
+}
+
+# Per-planet time series (health, players, owner, regen) recorded every refresh
+planet_history = {
+    "path": os.environ.get("HISTORY_DB", str(Path(__file__).resolve().parent.parent / "data" / "history.sqlite3")),
+    "raw_retention_hours": float(os.environ.get("HISTORY_RAW_HOURS", 24)), # Full-resolution samples
+    "hourly_retention_days": float(os.environ.get("HISTORY_HOURLY_DAYS", 180)), # Hourly averages after that
+}
+
+# Snapshots shared between uvicorn workers: one leader refreshes from upstream, the rest read its memory-mapped output
+shared_snapshot = {
+    "directory": os.environ.get("SHARED_SNAPSHOT_DIR", "/dev/shm/ahgs-api" if os.path.isdir("/dev/shm") else str(Path(__file__).resolve().parent.parent / "data" / "shared")),
+    "sync_interval": float(os.environ.get("SHARED_SNAPSHOT_SYNC", 1)), # Seconds between followers checking for a new generation
+    "external_poller": os.environ.get("EXTERNAL_POLLER", "0") == "1", # main_exe.py is deployed: API workers only follow, never lead
+}
+
+# resources/json is preprocessed into one memory-mapped bundle, rebuilt whenever the source files change
+static_resources = {
+    "directory": os.environ.get("STATIC_JSON_DIR", str(Path(__file__).resolve().parent.parent / "resources" / "json")),
+    "bundle_path": os.environ.get("STATIC_BUNDLE", str(Path(__file__).resolve().parent.parent / "data" / "static_bundle.bin")),
+}
+
+# Backend for every JSON decode/encode: "orjson" (falls back to "json" if it isn't installed) or "json"
+json_codec = {
+    "backend": os.environ.get("JSON_BACKEND", "orjson"),
+}
+
+# Timezone for major order expiry times, shared by the API and the poller (https://en.wikipedia.org/wiki/List_of_tz_database_time_zones)
+major_orders = {
+    "timezone": os.environ.get("MAJOR_ORDER_TIMEZONE", "UTC"),
+}
+
+# Seconds a cached response stays fresh (ttl), then how long past that it may still be served while refreshing (stale_ttl)
+response_cache = {
+    "major_order": {"ttl": 30, "stale_ttl": 300},
+    "war": {"ttl": 10, "stale_ttl": 120},
+}
+
 
 base_url = os.environ["BASE_URL"]
 
@@ -1,130 +1,236 @@
+import argparse
 import time
-import json
 
 # File Importing
 from utils.parse_conf import data_fetcher
 from conf import settings
-from utils.parse_conf import major_order_parser
-from utils.parse_conf import galaxy_stats_parser
+from utils.parse_conf.galaxy_stats_parser import parse_galaxy_stats
+from utils.parse_conf.major_order_parser import MajorOrderParser
 from utils.parse_conf.planet_data_parser import PlanetParser
+from utils.parse_conf.planet_projection import CampaignProjector
+from utils.parse_conf.history_store import HistoryStore
+from utils.parse_conf.snapshot_store import SnapshotStore
+from utils.parse_conf.shared_snapshot import SharedSnapshot
+from utils.parse_conf.static_resources import StaticResources
+from utils.parse_conf.poll_scheduler import AdaptivePollScheduler
 
-# https://en.wikipedia.org/wiki/List_of_tz_database_time_zones
-user_timezone = "America/Toronto"
 
-# Save JSON info to file function
-def save_json_to_file(data, filename):
-    try:
-        with open(filename, "w", encoding='utf-8') as f:
-            json.dump(data, f, indent=4) 
-        print(f"Data successfully saved to {filename}")
-    except IOError as e:
-        print(f"Error saving data to file: {e}")
-
-
-def main_program():
+class Poller():
     """
-        Main function for fetching and parsing data
+        Headless upstream consumer. Parsers, the HTTP session and the
+        static data are built once; each cycle refreshes only the
+        endpoints whose interval has run out and publishes the results
+        to the shared snapshot, so API workers started next to it just
+        follow along instead of polling upstream themselves.
     """
-    print("\n---- Beginning new data refresh cycle ----")
-    
-    ### PARSE ALL PLANETS ONCE
-    planet_parser = PlanetParser()
-    
-    ### MAJOR ORDER-RELATED CODE ###
-    major_order_url = settings.urls.get("major_order")
-    if major_order_url:
-        major_orders_data = data_fetcher.fetch_data_from_url(major_order_url)
-        if major_orders_data is not None:
-            # save_json_to_file(major_orders_data, "raw_mo_data") #<------- SAVES
-
-            print("\nSuccessfully fetched raw data for Major Orders. Now parsing...")
-            parsed_orders = major_order_parser.parse_major_order_data(major_orders_data, planet_parser, user_timezone)
-            if parsed_orders is not None:
-                if not parsed_orders:
-                    print("\n    There are currently no active Major Orders.")
-
-                
-                else:
-                    print("\nSuccesfully parsed the following Major Order(s):")
-                    for order in parsed_orders:
-                        print(f"        {order.get("order_title")}") # "MAJOR ORDER or SECONDARY ORDER"
-                        print("    -------------------")
-                        
-                        print(f"    Briefing: {order.get("order_briefing")}")
-                        
-                        tasks = order.get("tasks", [])
-                        if tasks:
-                            print("\n    --- OBJECTIVES ---")
-                            for i, task in enumerate(tasks):
-                                progress = task.get('progress', 0)
-                                goal = task.get('goal', 1)
-                                # Format with commas for readability
-                                progress_str = f"{progress:,}"
-                                goal_str = f"{goal:,}"
-                                
-                                print(f"    Objective {i+1}:")
-                                print(f"        Task Type ID: {task.get('type')}")
-                                print(f"        Target Planet: {task.get('target_name')} (ID: {task.get('target_planet_id')})")
-                                print(f"        Progress: {progress_str} / {goal_str}")
-                                # Simple percentage calculation
-                                if goal > 0:
-                                    percentage = (progress / goal) * 100
-                                    print(f"        Completion: {percentage:.4f}%")
-                            print("    ------------------")
-
-                        print(f"    Order Expires: {order.get("order_expires")}")
-
-                        if order.get("rewards_amount"):
-                            print(f"\n    Reward: {order.get("rewards_amount")} Medals")
-                        else:
-                            print("\n    This order type does not include any rewards.")
-                        
-            else:
-                print("\nFailed to parse Major Orders data.")
-        else:
-            print("\nFailed to fetch Major Order data.")
-
 
-    ### GALAXY-RELATED CODE ###
-    galaxy_stats_url = settings.urls.get("war")
-    if galaxy_stats_url:
-        galaxy_stats_data = data_fetcher.fetch_data_from_url(galaxy_stats_url)
-        if galaxy_stats_data:
-            print("\nSuccessfully fetched Galactic War statistics. Now parsing...")
-            parsed_galaxy_stats = galaxy_stats_parser.parse_galaxy_stats(galaxy_stats_data)
-            
-            if parsed_galaxy_stats:
-                print("\n    ---- GALACTIC WAR STATS ----")
-                
-                for line in parsed_galaxy_stats:
-                    print(f"    {line}")
-
-            else:
-                print("\nFailed to parse Galactic War stats.")
-        else:
-            print("\nFailed to fetch Major Orders data from endpoint.")
-    else:
-        print("\nGalaxy stats cannot be found on the API.")
-    
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+
+        static_resources = StaticResources(settings.static_resources["directory"], settings.static_resources["bundle_path"])
+        self.snapshot_store = SnapshotStore(settings.planet_snapshots["directory"])
+        self.shared_snapshot = SharedSnapshot(settings.shared_snapshot["directory"])
+        self.history_store = HistoryStore(
+            settings.planet_history["path"],
+            raw_retention_hours=settings.planet_history["raw_retention_hours"],
+            hourly_retention_days=settings.planet_history["hourly_retention_days"],
+        )
+
+        projector = CampaignProjector()
+        self.planet_parser = PlanetParser(
+            static_resources=static_resources, # Reads only the sections it uses
+            snapshot_store=self.snapshot_store,
+            projector=projector,
+            fetch_on_init=False,
+        )
+
+        # Pick up campaign trends where the last run left off
+        projection_start = time.time() - projector.window_seconds
+        projector.seed(self.planet_parser.combined_data, {
+            index: [(sample["timestamp"], sample["currentHealth"]) for sample in self.history_store.query(index, projection_start, resolution="raw")]
+            for index, planet in self.planet_parser.combined_data.items()
+            if CampaignProjector.is_campaign(planet)
+        })
+
+        self.mo_parser = MajorOrderParser(
+            planet_parser=self.planet_parser,
+            static_resources=static_resources,
+            user_timezone=settings.major_orders["timezone"],
+        )
+
+        # Intervals start from the old fixed values, then follow how often each payload changes
+        self.scheduler = AdaptivePollScheduler.from_settings({
+            "planets": settings.ahgs_api["time_delay"],
+            "major_order": settings.response_cache["major_order"]["ttl"],
+            "war": settings.response_cache["war"]["ttl"],
+        })
+
+        # Endpoint -> refresh function and when it's next due (monotonic seconds)
+        self._saved = {} # Dataset -> parsed value last written out
+
+        self.endpoints = {
+            "planets": {"refresh": self.refresh_planets, "next_due": 0.0},
+            "major_order": {"refresh": self.refresh_major_orders, "next_due": 0.0},
+            "war": {"refresh": self.refresh_galaxy_stats, "next_due": 0.0},
+        }
+
+
+    def refresh_planets(self):
+        # Carry on from whatever an earlier poller or API worker published, never below it
+        self.planet_parser.continue_from(self.shared_snapshot.generation("planets"))
+        version = self.planet_parser.version
+        self.planet_parser.refresh()
+        snapshot = self.planet_parser.snapshot
+        if snapshot.version == version:
+            return # Upstream unchanged (or unreachable): the current snapshot stands
+
+        planets = snapshot.planets
+        self.shared_snapshot.publish("planets", snapshot.planets_json, snapshot.planets_json_gzip, generation=snapshot.version)
+        self.history_store.record(planets)
+
+        if self.verbose:
+            print(f"\nSuccessfully parsed data for {len(planets)} planets.")
+            for i, planet in enumerate(list(planets.values())[:5]):
+                print(f"    {i+1}, {planet.get('name')} | Sector: {planet.get('sector')} | Biome: {planet.get('biomeName')}")
+            print("----------------------------")
+
+
+    def _save(self, name, value) -> bool:
+        # Parsers return their memoized result for a byte-identical payload; don't write it out again
+        if self._saved.get(name) is value:
+            return False
+        self._saved[name] = value
+        self.snapshot_store.save(name, value)
+        self.shared_snapshot.publish_json(name, value)
+        return True
+
+
+    def refresh_major_orders(self):
+        major_order_url = settings.urls.get("major_order")
+        started = time.monotonic()
+        major_orders_data = data_fetcher.fetch_data_from_url(major_order_url)
+        if major_orders_data is None:
+            print("Failed to fetch Major Order data.")
+            return
 
-    ### PLANET-RELATED CODE ###
-    print("\nFetching and parsing all planet data...")
-    all_planets = planet_parser.get_all_planets()
-    if all_planets:
-        print(f"\nSuccessfully parsed data for {len(all_planets)} planets.")
+        parsed_orders = self.mo_parser.parse_major_order_data(major_orders_data, data_fetcher.get_payload_hash(major_order_url, started))
+        if parsed_orders is None:
+            print("Failed to parse Major Orders data.")
+            return
 
-        for i, planet in enumerate(list(all_planets.values())[:5]):
-            print(f"    {i+1}, {planet.get('name')} | Sector: {planet.get('sector')} | Biome: {planet.get('biome')}")
-        print("----------------------------")
-    else:
-        print("\nCould not fetch or parse planet data.")
+        if self._save("major_order", parsed_orders) and self.verbose:
+            print_major_orders(parsed_orders)
 
-    print("\n    ---- Data refresh cycle complete ----")
 
+    def refresh_galaxy_stats(self):
+        galaxy_stats_url = settings.urls.get("war")
+        started = time.monotonic()
+        galaxy_stats_data = data_fetcher.fetch_data_from_url(galaxy_stats_url)
+        if not galaxy_stats_data:
+            print("Failed to fetch Galactic War statistics.")
+            return
+
+        galaxy_stats = parse_galaxy_stats(galaxy_stats_data, data_fetcher.get_payload_hash(galaxy_stats_url, started))
+        if not galaxy_stats:
+            print("Failed to parse Galactic War stats.")
+            return
+
+        if self._save("war", galaxy_stats) and self.verbose:
+            print("\n    ---- GALACTIC WAR STATS ----")
+            for key, value in galaxy_stats.items():
+                print(f"    {key}: {value}")
+
+
+    def run_cycle(self):
+        # Refreshes whatever is due and reports how long each part took
+        cycle_started = time.monotonic()
+        timings = []
+
+        for name, endpoint in self.endpoints.items():
+            if endpoint["next_due"] > cycle_started:
+                continue
+
+            time.sleep(self.scheduler.reserve(name)) # Stay under the upstream rate limit
+            started = time.monotonic()
+            try:
+                endpoint["refresh"]()
+            except Exception as e:
+                # One failing endpoint shouldn't stop the others; it's retried next interval
+                print(f"Refreshing '{name}' failed: {e}")
+            duration = time.monotonic() - started
+
+            # Interval is measured from the start of the refresh, not the end
+            interval = self.scheduler.observe(name, started)
+            endpoint["next_due"] = started + interval
+            timings.append(f"{name} {duration * 1000:.0f} ms, next in {interval:.0f}s")
+
+        if timings:
+            print(f"Cycle done in {(time.monotonic() - cycle_started) * 1000:.0f} ms ({', '.join(timings)})")
+
+
+    def run(self, once: bool = False):
+        try:
+            while True:
+                # The API workers poll upstream themselves until the poller holds the leader lock.
+                # Run them with EXTERNAL_POLLER=1 so they never take it in the first place.
+                if not self.shared_snapshot.try_lead():
+                    print("Another process is the snapshot leader (set EXTERNAL_POLLER=1 on the API workers); retrying in 5 seconds...")
+                    time.sleep(5)
+                    continue
+
+                self.run_cycle()
+                if once:
+                    break
+
+                next_due = min(endpoint["next_due"] for endpoint in self.endpoints.values())
+                time.sleep(max(0, next_due - time.monotonic()))
+        except KeyboardInterrupt:
+            print("\nPoller stopped.")
+        finally:
+            self.shared_snapshot.release()
+            self.history_store.close()
+
+
+def print_major_orders(parsed_orders):
+    if not parsed_orders:
+        print("\n    There are currently no active Major Orders.")
+        return
+
+    print("\nSuccesfully parsed the following Major Order(s):")
+    for order in parsed_orders:
+        print(f"        {order.get('orderTitle')}") # "MAJOR ORDER or SECONDARY ORDER"
+        print("    -------------------")
+
+        print(f"    Briefing: {order.get('orderBriefing')}")
+
+        tasks = order.get("tasks", [])
+        if tasks:
+            print("\n    --- OBJECTIVES ---")
+            for i, task in enumerate(tasks):
+                progress = task.get('progress') or 0
+                goal = task.get('goal') or 1
+                # Format with commas for readability
+                print(f"    Objective {i+1}:")
+                print(f"        Task Type: {task.get('typeName')} (ID: {task.get('type')})")
+                print(f"        Target: {task.get('targetName')} (Planet ID: {task.get('targetPlanetId')})")
+                print(f"        Progress: {progress:,} / {goal:,}")
+                # Simple percentage calculation
+                if goal > 0:
+                    print(f"        Completion: {(progress / goal) * 100:.4f}%")
+            print("    ------------------")
+
+        print(f"    Order Expires: {order.get('orderExpires')}")
+
+        if order.get("rewardsAmount"):
+            print(f"\n    Reward: {order.get('rewardsAmount')} Medals")
+        else:
+            print("\n    This order type does not include any rewards.")
 
 
 if __name__ == "__main__":
-    while True:
-        main_program()
-        print("\nWaiting 10 seconds before next refresh...")
-        time.sleep(10)
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description="Poll the upstream API and publish snapshots for the API workers.")
+    arg_parser.add_argument("--once", action="store_true", help="run a single refresh cycle and exit")
+    arg_parser.add_argument("--verbose", action="store_true", help="print the parsed data after each refresh")
+    args = arg_parser.parse_args()
+
+    Poller(verbose=args.verbose).run(once=args.once)
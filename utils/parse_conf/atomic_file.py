@@ -0,0 +1,52 @@
+import mmap
+import os
+import struct
+import tempfile
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+# Files shared between processes (snapshots, the static bundle) are written whole
+# and renamed into place, and read back through a read-only mapping behind a magic header.
+
+
+def write_atomic(path: str, chunks: Iterable[bytes], fsync: bool = False):
+    # Temp file in the same directory, then renamed over `path`: readers see the old file
+    # or the new one, never a partial write. Raises OSError, after removing the temp file.
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644) # mkstemp creates it owner-only; workers may run as another user
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def map_file(path: str, magic: bytes, read_header: Callable[[mmap.mmap, int], Any], label: str) -> Optional[Tuple[mmap.mmap, Any]]:
+    # Read-only mapping of `path` plus whatever read_header(mapped, offset after the magic)
+    # returns. None if the file is missing, empty or unreadable; read_header raises
+    # ValueError (or KeyError, TypeError, struct.error) for a bad header.
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError): # ValueError: an empty file can't be mapped
+        return None
+
+    try:
+        if mapped[:len(magic)] != magic:
+            raise ValueError("bad magic")
+        header = read_header(mapped, len(magic))
+    except (ValueError, KeyError, TypeError, struct.error) as e:
+        print(f"Ignoring unreadable {label}: {e}")
+        mapped.close()
+        return None
+    return mapped, header
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Set
+
+
+class Broadcaster():
+    """
+        Fans one pre-serialized message out to every connected subscriber.
+        Each subscriber has a small bounded queue; a client that falls
+        behind has its backlog dropped and is told to resync, so one slow
+        connection never holds up the others.
+    """
+
+    RESYNC_MESSAGE = '{"type":"resync"}'
+
+    def __init__(self, queue_size: int = 8):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+
+
+    def __len__(self):
+        return len(self._subscribers)
+
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+
+    def publish(self, message: str):
+        # Must be called from the event loop thread
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow client: the deltas it missed are useless now, so replace
+                # them with one resync marker (client re-reads /api/planets/changes)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.RESYNC_MESSAGE)
@@ -1,9 +1,208 @@
 import requests
-import json
+import httpx
+import asyncio
+import hashlib
 import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from conf import settings
+from utils.parse_conf import json_codec
+from utils.parse_conf.json_stream import iter_array_elements
+
+# Shared pool for fetching several endpoints at once
+_fan_out_pool = ThreadPoolExecutor(max_workers=settings.http_client["fan_out_workers"], thread_name_prefix="fetch")
+
+# Statuses worth retrying (rate limited or upstream hiccup)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+_async_client = None
+_async_client_loop = None
+_closing_clients = set()
+
+# Last validators (ETag / Last-Modified) per URL, with the decoded payload (or, for streamed URLs, the raw body) for conditional GETs
+_conditional_cache = {}
+_conditional_lock = threading.Lock()
+
+# Content hash of the last good payload per URL, and when it was last confirmed (monotonic seconds)
+_payload_hashes = {}
+
+
+def _build_headers():
+    return {
+        "User-Agent": f"{os.environ.get("USER_AGENT")}",
+        "X-Super-Client": f"{os.environ.get("SUPER_CLIENT")}",
+        "X-Super-Contact": f"{os.environ.get("SUPER_CONTACT")}",
+        "Accept": "application/json"
+    }
+
+
+class _CappedRetry(Retry):
+    # urllib3 sleeps for the full Retry-After; cap it at backoff_max like the async path does
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, settings.http_client["backoff_max"])
+
+
+# One pooled, keep-alive session shared by every fetch in the project
+def get_session():
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                config = settings.http_client
+
+                # Retries 429/5xx with jittered exponential backoff, honouring Retry-After (up to backoff_max)
+                retry = _CappedRetry(
+                    total=config["max_retries"],
+                    backoff_factor=config["backoff_factor"],
+                    backoff_jitter=config["backoff_jitter"],
+                    backoff_max=config["backoff_max"],
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset(["GET"]),
+                    respect_retry_after_header=True,
+                    raise_on_status=False, # Hand back the last response so it gets logged below
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=config["pool_connections"],
+                    pool_maxsize=config["pool_maxsize"],
+                    max_retries=retry,
+                )
+
+                session = requests.Session()
+                session.headers.update(_build_headers())
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+
+    return _session
+
+
+def get_timeout():
+    # (connect, read) tuple understood by requests
+    return (settings.http_client["connect_timeout"], settings.http_client["read_timeout"])
+
+
+# Async counterpart of get_session(), for code running on the event loop
+def get_async_client():
+    global _async_client, _async_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        if _async_client is not None:
+            _close_stale_client(_async_client, _async_client_loop)
+
+        config = settings.http_client
+        _async_client = httpx.AsyncClient(
+            headers=_build_headers(),
+            limits=httpx.Limits(max_connections=config["pool_maxsize"], max_keepalive_connections=config["pool_maxsize"]),
+            timeout=httpx.Timeout(config["read_timeout"], connect=config["connect_timeout"]),
+        )
+        _async_client_loop = loop
+
+    return _async_client
+
+
+def _close_stale_client(client, client_loop):
+    # Closes the pool of a client made on another loop. If that loop is still running the
+    # close runs there; otherwise here, best effort, since its sockets belonged to the old loop.
+    async def close():
+        try:
+            await client.aclose()
+        except RuntimeError:
+            pass # Old loop already closed; its transports went with it, the pool is released regardless
+
+    if client_loop is not None and client_loop.is_running() and not client_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(close(), client_loop)
+    else:
+        task = asyncio.get_running_loop().create_task(close())
+        _closing_clients.add(task) # The loop only keeps weak references to tasks
+        task.add_done_callback(_closing_clients.discard)
+
+
+async def close_async_client():
+    global _async_client, _async_client_loop
+
+    if _async_client is not None:
+        await _async_client.aclose()
+    _async_client = None
+    _async_client_loop = None
+
+
+def _backoff_delay(attempt, retry_after=None):
+    # Same policy as the sync session's Retry: honour Retry-After, else jittered exponential backoff
+    config = settings.http_client
+
+    if retry_after:
+        try:
+            return min(float(retry_after), config["backoff_max"])
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                return min(max(seconds, 0), config["backoff_max"])
+            except (TypeError, ValueError):
+                pass
+
+    delay = config["backoff_factor"] * (2 ** attempt) + random.uniform(0, config["backoff_jitter"])
+    return min(delay, config["backoff_max"])
+
+
+def _cached_entry(full_url, key):
+    # Validators are only worth sending when the matching copy ("payload" or "body") is there to fall back on
+    cached = _conditional_cache.get(full_url)
+    return cached if cached is not None and cached.get(key) is not None else None
+
+
+def _conditional_headers(cached):
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def _remember_hash(full_url, content=None):
+    # content=None means a 304: the previous hash still holds, it was just confirmed again
+    if content is None:
+        previous = _payload_hashes.get(full_url)
+        if previous is not None:
+            _payload_hashes[full_url] = (previous[0], time.monotonic())
+        return
+    _payload_hashes[full_url] = (hashlib.blake2b(content, digest_size=16).hexdigest(), time.monotonic())
+
+
+def get_payload_hash(full_url, since=None):
+    # Hash of the URL's latest payload, or None if it hasn't been fetched successfully (since `since`)
+    entry = _payload_hashes.get(full_url)
+    if entry is None or (since is not None and entry[1] < since):
+        return None
+    return entry[0]
+
+
+def _remember_validators(full_url, response, payload=None, body=None):
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+
+    with _conditional_lock:
+        if etag or last_modified:
+            _conditional_cache[full_url] = {"etag": etag, "last_modified": last_modified, "payload": payload, "body": body}
+        else:
+            # Upstream stopped sending validators; don't hold on to a payload we can't revalidate
+            _conditional_cache.pop(full_url, None)
+
 
 # Fetch API data
-def fetch_data_from_url(full_url):
+def fetch_data_from_url(full_url, timeout=None):
    
     if not full_url:
         print("\nError: No URL provided.")
@@ -12,13 +211,14 @@ def fetch_data_from_url(full_url):
     print(f"\nAttempting to fetch data from: {full_url}")
 
     try:
-        headers = {
-            "User-Agent": f"{os.environ.get("USER_AGENT")}",
-            "X-Super-Client": f"{os.environ.get("SUPER_CLIENT")}",
-            "X-Super-Contact": f"{os.environ.get("SUPER_CONTACT")}",
-            "Accept": "application/json"
-        }
-        response = requests.get(full_url, headers=headers)
+        cached = _cached_entry(full_url, "payload")
+        response = get_session().get(full_url, headers=_conditional_headers(cached), timeout=timeout or get_timeout())
+
+        # Nothing changed upstream; skip the download and the JSON decode
+        if response.status_code == 304 and cached is not None:
+            print("✅ API Request Successful! (Not modified, using cached data)")
+            _remember_hash(full_url)
+            return cached["payload"]
         
         # --- DEBUG: Print what happened ---
         if response.status_code != 200:
@@ -30,14 +230,228 @@ def fetch_data_from_url(full_url):
 
         response.raise_for_status() # Raises an exception if HTTP error encountered
         
-        if not response.text.strip():
+        if not response.content.strip():
+            _remember_hash(full_url, b"")
             return []
         
-        return response.json()
+        payload = json_codec.loads(response.content) # Straight from the bytes, no intermediate str
+        _remember_validators(full_url, response, payload)
+        _remember_hash(full_url, response.content)
+        return payload
     
     except requests.exceptions.RequestException as exc:
         print(f"\nError fetching data from {full_url} endpoint: {exc}")
         return None
-    except json.JSONDecodeError:
+    except json_codec.JSONDecodeError:
+        print(f"\nError: Failed to decode JSON from response at {full_url}")
+        return None
+
+
+# Fetch several endpoints in parallel; total time is roughly the slowest single call
+def fetch_many(urls, timeout=None, deadline=None):
+    deadline = deadline or settings.http_client["fan_out_deadline"]
+
+    futures = {url: _fan_out_pool.submit(fetch_data_from_url, url, timeout) for url in urls}
+    done, not_done = wait(futures.values(), timeout=deadline)
+
+    results = {}
+    for url, future in futures.items():
+        if future in done:
+            results[url] = future.result()
+        else:
+            # Left running in the pool, but the caller stops waiting for it
+            print(f"\nError: {url} did not respond within the {deadline}s deadline.")
+            results[url] = None
+
+    return results
+
+
+# Starts the streamed GET of stream_url alongside the plain fetches of urls, so they all
+# share one round trip. Returns (results, element iterator or None); the deadline covers
+# the plain fetches and the whole streamed body.
+def fetch_with_stream(urls, stream_url, timeout=None, deadline=None):
+    deadline = deadline or settings.http_client["fan_out_deadline"]
+    expires = time.monotonic() + deadline
+
+    stream_future = _fan_out_pool.submit(stream_array_from_url, stream_url, timeout, deadline)
+    results = fetch_many(urls, timeout, deadline)
+
+    done, _ = wait((stream_future,), timeout=max(0, expires - time.monotonic()))
+    if stream_future in done:
+        return results, stream_future.result()
+    print(f"\nError: {stream_url} did not respond within the {deadline}s deadline.")
+    stream_future.add_done_callback(_close_abandoned_stream)
+    return results, None
+
+
+def _close_abandoned_stream(future):
+    # A stream that opened after its caller gave up: release the connection instead of leaking it
+    if not future.cancelled() and future.exception() is None and future.result() is not None:
+        future.result().close()
+
+
+# Streamed fetch of a top-level JSON array: returns an iterator over the raw bytes of
+# each element, produced as the body downloads, or None if the request itself failed.
+# Errors partway through the body, including running past the deadline, are raised from the iterator.
+def stream_array_from_url(full_url, timeout=None, deadline=None):
+
+    if not full_url:
+        print("\nError: No URL provided.")
+        return None
+
+    deadline = deadline or settings.http_client["fan_out_deadline"]
+    expires = time.monotonic() + deadline
+
+    print(f"\nAttempting to stream data from: {full_url}")
+
+    try:
+        cached = _cached_entry(full_url, "body")
+        response = get_session().get(full_url, headers=_conditional_headers(cached), timeout=timeout or get_timeout(), stream=True)
+
+        # Nothing changed upstream; replay the kept body instead of downloading it again
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            print("✅ API Request Successful! (Not modified, using cached data)")
+            _remember_hash(full_url)
+            return iter_array_elements((cached["body"],))
+
+        if response.status_code != 200:
+            print(f"❌ API Request Failed! Status Code: {response.status_code}")
+            print(f"Response text: {response.text[:200]}")
+            response.raise_for_status()
+        print("✅ API Request Successful! (Streaming)")
+
+    except requests.exceptions.RequestException as exc:
+        print(f"\nError fetching data from {full_url} endpoint: {exc}")
+        return None
+
+    elements = _stream_elements(full_url, response, deadline, expires)
+    next(elements) # Enter its `with response:`, so close() releases the connection even if nothing is read
+    return elements
+
+
+def _stream_elements(full_url, response, deadline, expires):
+    # The body is hashed (and kept, if upstream sends validators) chunk by chunk on its
+    # way to the scanner; the hash is only recorded once the whole array has arrived.
+    # Keeping the raw bytes for 304s is still far smaller than the decoded list.
+    digest = hashlib.blake2b(digest_size=16)
+    keep_body = bool(response.headers.get("ETag") or response.headers.get("Last-Modified"))
+    body = []
+
+    def read_chunks():
+        for chunk in response.iter_content(settings.http_client["stream_chunk_size"]):
+            # Each read is bounded by the read timeout; this bounds a body that keeps trickling in
+            if time.monotonic() > expires:
+                raise TimeoutError(f"{full_url} did not finish within the {deadline}s deadline")
+            digest.update(chunk)
+            if keep_body:
+                body.append(chunk)
+            yield chunk
+
+    with response:
+        yield None # Priming step, taken by stream_array_from_url
+        chunks = read_chunks()
+        yield from iter_array_elements(chunks)
+        for _ in chunks: # Trailing whitespace after the closing bracket still counts towards the hash
+            pass
+
+    _payload_hashes[full_url] = (digest.hexdigest(), time.monotonic())
+    _remember_validators(full_url, response, body=b"".join(body) if keep_body else None)
+
+
+# Async fetch for handlers and refresh jobs running on the event loop
+async def async_fetch_data_from_url(full_url, timeout=None):
+
+    if not full_url:
+        print("\nError: No URL provided.")
+        return None
+
+    print(f"\nAttempting to fetch data from: {full_url}")
+
+    client = get_async_client()
+    max_retries = settings.http_client["max_retries"]
+
+    try:
+        for attempt in range(max_retries + 1):
+            cached = _cached_entry(full_url, "payload")
+            try:
+                response = await client.get(full_url, headers=_conditional_headers(cached), timeout=timeout or httpx.USE_CLIENT_DEFAULT)
+            except httpx.TransportError:
+                if attempt == max_retries:
+                    raise
+                await asyncio.sleep(_backoff_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < max_retries:
+                await asyncio.sleep(_backoff_delay(attempt, response.headers.get("Retry-After")))
+                continue
+            break
+
+        # Nothing changed upstream; skip the JSON decode
+        if response.status_code == 304 and cached is not None:
+            print("✅ API Request Successful! (Not modified, using cached data)")
+            _remember_hash(full_url)
+            return cached["payload"]
+
+        if response.status_code != 200:
+            print(f"❌ API Request Failed! Status Code: {response.status_code}")
+            print(f"Response text: {response.text[:200]}")
+        else:
+            print(f"✅ API Request Successful! (Size: {len(response.content)} bytes)")
+
+        response.raise_for_status()
+
+        if not response.content.strip():
+            _remember_hash(full_url, b"")
+            return []
+
+        payload = json_codec.loads(response.content)
+        _remember_validators(full_url, response, payload)
+        _remember_hash(full_url, response.content)
+        return payload
+
+    except httpx.HTTPError as exc:
+        print(f"\nError fetching data from {full_url} endpoint: {exc}")
+        return None
+    except json_codec.JSONDecodeError:
         print(f"\nError: Failed to decode JSON from response at {full_url}")
-        return None
\ No newline at end of file
+        return None
+
+
+async def async_fetch_many(urls, timeout=None, deadline=None):
+    deadline = deadline or settings.http_client["fan_out_deadline"]
+
+    tasks = {url: asyncio.ensure_future(async_fetch_data_from_url(url, timeout)) for url in urls}
+    done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+
+    for task in pending:
+        task.cancel()
+
+    results = {}
+    for url, task in tasks.items():
+        if task in done:
+            results[url] = task.result()
+        else:
+            print(f"\nError: {url} did not respond within the {deadline}s deadline.")
+            results[url] = None
+
+    return results
+
+
+async def async_fetch_with_stream(urls, stream_url, timeout=None, deadline=None):
+    # Event-loop side of fetch_with_stream: the plain fetches run on the loop while the
+    # streamed GET is opened in the fan-out pool. Reading the elements still blocks, so
+    # callers consume the iterator off the loop.
+    deadline = deadline or settings.http_client["fan_out_deadline"]
+    expires = time.monotonic() + deadline
+
+    stream_future = _fan_out_pool.submit(stream_array_from_url, stream_url, timeout, deadline)
+    results = await async_fetch_many(urls, timeout, deadline)
+
+    try:
+        elements = await asyncio.wait_for(asyncio.wrap_future(stream_future), max(0, expires - time.monotonic()))
+    except asyncio.TimeoutError:
+        print(f"\nError: {stream_url} did not respond within the {deadline}s deadline.")
+        stream_future.add_done_callback(_close_abandoned_stream)
+        elements = None
+    return results, elements
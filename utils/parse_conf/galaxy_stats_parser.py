@@ -1,15 +1,21 @@
-import json
 import time
+from utils.parse_conf import json_codec
 from utils.parse_conf import datetime_converter
 
+# Last result and the payload hash it came from; the same bytes parse to the same stats
+_last_parse = {"hash": None, "result": None}
+
 # Stats parser
-def parse_galaxy_stats(data):
+def parse_galaxy_stats(data, payload_hash=None):
     #parsed_container = {}
 
+    if payload_hash is not None and payload_hash == _last_parse["hash"]:
+        return _last_parse["result"]
+
     if isinstance(data, str):
         try:
-            data = json.loads(data)
-        except json.JSONDecodeError:
+            data = json_codec.loads(data)
+        except json_codec.JSONDecodeError:
             print("Error: Received a string that could not be decoded as JSON.")
             return None
 
@@ -20,7 +26,8 @@ def parse_galaxy_stats(data):
 
     try:
         
-        overall_stats_dict = data.get("statistics", {})
+        # Copy so the fetch layer's cached payload isn't modified in place
+        overall_stats_dict = dict(data.get("statistics", {}))
 
         if not overall_stats_dict:
             return ["No overall stats available."]
@@ -70,6 +77,8 @@ def parse_galaxy_stats(data):
         overall_stats_dict['missionsWonPercent'] = missions_won_percent
         overall_stats_dict['totalMissionTime'] = total_mission_time
 
+        _last_parse["hash"] = payload_hash
+        _last_parse["result"] = overall_stats_dict
         return overall_stats_dict
 
     except Exception as e:
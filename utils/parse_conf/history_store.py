@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class HistoryStore():
+    """
+        Append-only time series of per-planet health, players, owner
+        and regen, recorded once per refresh. Raw samples are kept for
+        a short window, then rolled up into hourly averages, and the
+        hourly rows are dropped after the retention period so the
+        database stays bounded.
+    """
+
+    def __init__(self, path: str, raw_retention_hours: float = 24, hourly_retention_days: float = 180):
+        self.path = path
+        self.raw_retention = raw_retention_hours * 3600
+        self.hourly_retention = hourly_retention_days * 86400
+        self._last_compaction = 0.0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # One connection shared by the refresh thread and request handlers
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            # WITHOUT ROWID + (planet, ts) primary key keeps a planet's samples together on disk
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS planet_history (
+                    planet INTEGER NOT NULL,
+                    ts INTEGER NOT NULL,
+                    health INTEGER,
+                    players INTEGER,
+                    owner TEXT,
+                    regen REAL,
+                    PRIMARY KEY (planet, ts)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS planet_history_hourly (
+                    planet INTEGER NOT NULL,
+                    ts INTEGER NOT NULL,
+                    health REAL,
+                    players REAL,
+                    owner TEXT,
+                    regen REAL,
+                    samples INTEGER,
+                    PRIMARY KEY (planet, ts)
+                ) WITHOUT ROWID
+            """)
+
+
+    def record(self, planets: Dict[int, Dict[str, Any]], timestamp: Optional[float] = None):
+        # One batched insert per refresh
+        ts = int(timestamp or time.time())
+        rows = [
+            (
+                index,
+                ts,
+                _as_number(planet.get("currentHealth")),
+                _as_number(planet.get("players")),
+                str(planet.get("owner")),
+                _as_number(planet.get("regenPerSecond")),
+            )
+            for index, planet in planets.items()
+        ]
+
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO planet_history VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+        # Compaction is cheap but there's no need to run it every refresh
+        if ts - self._last_compaction >= 3600:
+            self.compact(ts)
+
+
+    def compact(self, now: Optional[float] = None):
+        # Roll raw samples older than the raw window into hourly buckets, then enforce retention
+        now = int(now or time.time())
+        raw_cutoff = now - int(self.raw_retention)
+        raw_cutoff -= raw_cutoff % 3600 # Only roll up whole hours
+        hourly_cutoff = now - int(self.hourly_retention)
+
+        with self._lock, self._conn:
+            # The bare `owner` column takes its value from the MAX(ts) row, i.e. the owner at the end of the hour
+            self._conn.execute("""
+                INSERT OR REPLACE INTO planet_history_hourly
+                SELECT planet, bucket, health, players, owner, regen, samples FROM (
+                    SELECT planet, (ts / 3600) * 3600 AS bucket, AVG(health) AS health, AVG(players) AS players,
+                           owner, AVG(regen) AS regen, COUNT(*) AS samples, MAX(ts)
+                    FROM planet_history
+                    WHERE ts < ?
+                    GROUP BY planet, bucket
+                )
+            """, (raw_cutoff,))
+            self._conn.execute("DELETE FROM planet_history WHERE ts < ?", (raw_cutoff,))
+            self._conn.execute("DELETE FROM planet_history_hourly WHERE ts < ?", (hourly_cutoff,))
+
+        self._last_compaction = now
+
+
+    def query(self, planet_index: int, start: Optional[float] = None, end: Optional[float] = None, resolution: str = "auto") -> List[Dict[str, Any]]:
+        # resolution: "raw", "hourly", or "auto" (hourly rows for the old part of the range, raw for the rest)
+        end = int(end or time.time())
+        start = int(start or end - 86400)
+
+        hourly_sql = "SELECT ts, health, players, owner, regen FROM planet_history_hourly WHERE planet = ? AND ts BETWEEN ? AND ? ORDER BY ts"
+        raw_sql = "SELECT ts, health, players, owner, regen FROM planet_history WHERE planet = ? AND ts BETWEEN ? AND ? ORDER BY ts"
+
+        with self._lock:
+            if resolution == "raw":
+                rows = self._conn.execute(raw_sql, (planet_index, start, end)).fetchall()
+            elif resolution == "hourly":
+                rows = self._conn.execute(hourly_sql, (planet_index, start, end)).fetchall()
+            else:
+                rows = self._conn.execute(hourly_sql, (planet_index, start, end)).fetchall()
+                raw_start = rows[-1][0] + 3600 if rows else start
+                rows += self._conn.execute(raw_sql, (planet_index, raw_start, end)).fetchall()
+
+        return [
+            {"timestamp": ts, "currentHealth": health, "players": players, "owner": owner, "regenPerSecond": regen}
+            for ts, health, players, owner, regen in rows
+        ]
+
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _as_number(value):
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,45 @@
+import json
+from typing import Any, Union
+
+from conf import settings
+
+try:
+    import orjson
+except ImportError: # Optional speed-up; the stdlib decoder does the same job, slower
+    orjson = None
+
+# Every JSON decode and encode in the project goes through this module, so the
+# backend can be swapped in one place. orjson decodes straight from bytes (no
+# intermediate str) and encodes to bytes; the stdlib fallback mirrors that.
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+BACKENDS = ("orjson", "json")
+backend = None
+
+
+def use_backend(name: str):
+    # Pick the codec used by loads()/dumps(); "orjson" falls back to "json" if it isn't installed
+    global backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{name}', expected one of {BACKENDS}")
+    backend = name if name != "orjson" or orjson is not None else "json"
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    if backend == "orjson":
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes() # json.loads takes bytes or str, not buffers
+    return json.loads(data)
+
+
+def dumps(value: Any, non_str_keys: bool = False) -> bytes:
+    # Compact UTF-8 bytes. non_str_keys allows int keys (e.g. planet indexes); they become strings.
+    if backend == "orjson":
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS if non_str_keys else None)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+use_backend(settings.json_codec["backend"])
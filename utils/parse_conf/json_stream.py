@@ -0,0 +1,63 @@
+import re
+from typing import Iterable, Iterator
+
+# Runs of bytes the scanner can skip in one step: anything that isn't a bracket,
+# with whole strings (and whatever brackets they contain) taken as a unit. Between
+# top-level elements commas matter too. A string cut off by the end of a chunk stops
+# the run at its opening quote, to be rescanned once the next chunk is in.
+_STRING = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+_SKIP_NESTED = re.compile(rb'(?:[^"\[\]{}]++|' + _STRING + rb')*+', re.DOTALL)
+_SKIP_TOP = re.compile(rb'(?:[^"\[\]{},]++|' + _STRING + rb')*+', re.DOTALL)
+
+
+def iter_array_elements(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+        Splits a top-level JSON array into the raw bytes of each element
+        as the chunks arrive, without decoding anything. Only the element
+        being read is buffered, so the caller can decode (or skip) each
+        one while the rest is still downloading.
+    """
+    buffer = b""
+    position = 0 # Next byte to scan
+    start = None # Start of the current element
+    depth = 0
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+
+        # Drop everything before the current element; nothing before it is needed again
+        if start:
+            buffer = buffer[start:]
+            position -= start
+            start = 0
+        buffer += chunk
+
+        while True:
+            position = (_SKIP_TOP if depth <= 1 else _SKIP_NESTED).match(buffer, position).end()
+            if position == len(buffer) or buffer[position] == 0x22: # '"': string continues in the next chunk
+                break
+
+            char = buffer[position]
+            position += 1
+            if char == 0x5B or char == 0x7B: # '[' or '{'
+                if depth == 0:
+                    if char != 0x5B:
+                        raise ValueError("expected a JSON array at the top level")
+                    start = position
+                depth += 1
+            elif char == 0x5D or char == 0x7D: # ']' or '}'
+                depth -= 1
+                if depth == 0:
+                    element = buffer[start:position - 1].strip()
+                    if element:
+                        yield element
+                    return # Anything after the closing bracket is ignored
+            elif depth == 1: # ','
+                yield buffer[start:position - 1].strip()
+                start = position
+
+    if start is None and not buffer.strip():
+        return # Empty body, read as an empty list like fetch_data_from_url does
+    if depth or start is None:
+        raise ValueError("JSON array ended before its closing bracket" if depth else "expected a JSON array at the top level")
@@ -1,8 +1,5 @@
 from . import datetime_converter
 from utils.parse_conf.planet_data_parser import PlanetParser
-from utils.parse_conf.data_fetcher import fetch_data_from_url
-from conf import settings
-from json import loads
 
 class MajorOrderParser():
     """
@@ -10,17 +7,50 @@ class MajorOrderParser():
         of major order data.
     """
 
-    def __init__(self, planet_parser: PlanetParser, user_timezone="UTC", task_types_map=None, reward_types_map=None, value_types_map=None, item_names_map=None, factions_map=None):
+    def __init__(self, planet_parser: PlanetParser, static_resources, user_timezone="UTC"):
         self.planet_parser = planet_parser
         self.user_timezone = user_timezone
-        self.task_types_map = task_types_map or {}
-        self.reward_types_map = reward_types_map or {}
-        self.value_types_map = value_types_map or {}
-        self.item_names_map = item_names_map or {}
-        self.factions_map = factions_map or {}
+
+        # Task and value types are needed up front; items and factions are read on first lookup
+        self.static_resources = static_resources
+        self.task_types_map = static_resources.get("task_types") or {}
+        self.value_types_map = static_resources.get("task_value_types") or {}
 
         self.reverse_value_map = {v: k for k, v in self.value_types_map.items()}
 
+        # Resolved once here so per-task parsing does no map lookups or int() conversions
+        self.value_keys = self._build_value_keys()
+        self.goal_key = self.value_keys.get("goal")
+        self.planet_key = self.value_keys.get("locationIndex")
+        self.faction_key = self.value_keys.get("faction")
+        self.target_key = self.value_keys.get("targetID")
+        self.loc_type_key = self.value_keys.get("locationType")
+
+        # Reverse task-type index (name -> id)
+        self.task_type_ids = {name: type_id for type_id, name in self.task_types_map.items()}
+
+        # Last parse, reused when upstream sends the same payload or the same order again.
+        # Target names come from the planet snapshot, so both are keyed on its version too.
+        self._last_payload = (None, None) # ((payload hash, planet version), parsed orders)
+        self._parsed_orders = {} # id32 -> (raw order, planet version, parsed order)
+
+    @property
+    def item_names_map(self):
+        return self.static_resources.get("items") or {}
+
+    @property
+    def factions_map(self):
+        return self.static_resources.get("factions") or {}
+
+    def _build_value_keys(self):
+        value_keys = {}
+        for name, key_str in self.reverse_value_map.items():
+            try:
+                value_keys[name] = int(key_str)
+            except (ValueError, TypeError):
+                continue
+        return value_keys
+
     def get_item_name(self, item_id):
 
         if item_id is None:
@@ -37,89 +67,37 @@ class MajorOrderParser():
         return None
     
     def get_value_key(self, name):
-        key_str = self.reverse_value_map.get(name)
-        if key_str:
-            return int(key_str)
-        return None
+        return self.value_keys.get(name)
 
 
-    def parse_major_order_data(self, data):
+    def parse_major_order_data(self, data, payload_hash=None):
+        # Same bytes as the last parse (payload_hash from data_fetcher.get_payload_hash) against the
+        # same planet snapshot: same result
+        planet_version = self.planet_parser.version
+        if payload_hash is not None and self._last_payload[0] == (payload_hash, planet_version):
+            return self._last_payload[1]
+
         if not isinstance(data, list):
             print(f"Error: Expected a list of major orders, but received {type(data)}")
             return None
 
         parsed_orders = []
+        orders_by_id = {}
+        previous_orders = self._parsed_orders
 
         try:  
             for order in data:
-                order_data = {}
-                order_setting = order.get("setting", {})
-        
-                order_data["orderId"] = order.get("id32")
-                order_data["orderExpires"] = datetime_converter.get_expiration_from_seconds(order.get("expiresIn"), self.user_timezone)
-
-                # Order type
-                order_type_id = str(order_setting.get("type"))
-                order_type_name = self.task_types_map.get(order_type_id, "Unknown Objective Type")
-                order_data["orderType"] = order_type_id
-                order_data["orderTypeName"] = order_type_name
-
-                order_data["orderTitle"] = order_setting.get("overrideTitle")
-                order_data["orderBriefing"] = order_setting.get("overrideBrief")
-                order_data["orderTaskDescr"] = order_setting.get("taskDescription")
-
-                # Task-specifics
-                order_progress = order.get("progress")
-                order_data["orderProgress"] = order_progress
-
-                tasks_list = order_setting.get("tasks", [])
-                parsed_tasks = [] # Holds parsed tasks
-
-                for i, task in enumerate(tasks_list): # Enumerate turns a number into an index for a list
-                    task_details = {}
-                    values = task.get("values", [])
-                    value_types = task.get("valueTypes", [])
-                    value_map = dict(zip(value_types, values)) # Pair two value lists together
-                    
-                    task_type_id = str(task.get("type"))
-                    task_type_name = self.task_types_map.get(task_type_id, "Unknown Task Type")
-                    task_details["type"] = task_type_id
-                    task_details["typeName"] = task_type_name
-
-                    goal_key = self.get_value_key("goal")
-                    task_details["goal"] = value_map.get(goal_key)
-
-                    #############################
-                    ## Task's planet specifics ##
-                    ## ======================= ##
-
-                    target_info = self._resolve_task_details_by_type(task_type_name, value_map, values)
-
-                    task_details["targetName"] = target_info["name"]
-                    task_details["targetPlanetId"] = target_info.get("planet_id")
-                    
-                    if order_progress and i < len(order_progress):
-                        task_details["progress"] = order_progress[i]
-                    else:
-                        task_details["progress"] = 0
-
-                    parsed_tasks.append(task_details)
-
-                order_data["tasks"] = parsed_tasks
-
-                # Reward Parsing
-                rewards_list = order_setting.get("rewards", [])
-                if rewards_list and len(rewards_list) > 0:
-                    for reward in rewards_list:
-                        reward_type_id = str(reward.get("type"))
-                        order_data["rewardType"] = reward_type_id
-                        reward_amount = str(reward.get("amount"))
-                        order_data["rewardsAmount"] = reward_amount
+                # Orders whose upstream entry and planet snapshot are unchanged keep their parsed form
+                previous = previous_orders.get(order.get("id32"))
+                if previous is not None and previous[1] == planet_version and previous[0] == order:
+                    order_data = previous[2]
                 else:
-                    order_data["rewardsAmount"] = None
-                    
-
+                    order_data = self._parse_order(order)
                 parsed_orders.append(order_data)
+                orders_by_id[order.get("id32")] = (order, planet_version, order_data)
+
+            self._parsed_orders = orders_by_id
+            self._last_payload = ((payload_hash, planet_version), parsed_orders)
 
             print(f"Successfully parsed {len(parsed_orders)} major orders.")
             return parsed_orders
@@ -132,25 +110,86 @@ class MajorOrderParser():
             return None
         
     
+    def _parse_order(self, order):
+        order_data = {}
+        order_setting = order.get("setting", {})
+
+        order_data["orderId"] = order.get("id32")
+        order_data["orderExpires"] = datetime_converter.get_expiration_from_seconds(order.get("expiresIn"), self.user_timezone)
+
+        # Order type
+        order_type_id = str(order_setting.get("type"))
+        order_type_name = self.task_types_map.get(order_type_id, "Unknown Objective Type")
+        order_data["orderType"] = order_type_id
+        order_data["orderTypeName"] = order_type_name
+
+        order_data["orderTitle"] = order_setting.get("overrideTitle")
+        order_data["orderBriefing"] = order_setting.get("overrideBrief")
+        order_data["orderTaskDescr"] = order_setting.get("taskDescription")
+
+        # Task-specifics
+        order_progress = order.get("progress")
+        order_data["orderProgress"] = order_progress
+
+        tasks_list = order_setting.get("tasks", [])
+        parsed_tasks = [] # Holds parsed tasks
+
+        for i, task in enumerate(tasks_list): # Enumerate turns a number into an index for a list
+            task_details = {}
+            values = task.get("values", [])
+            value_types = task.get("valueTypes", [])
+            value_map = dict(zip(value_types, values)) # Pair two value lists together
+            
+            task_type_id = str(task.get("type"))
+            task_type_name = self.task_types_map.get(task_type_id, "Unknown Task Type")
+            task_details["type"] = task_type_id
+            task_details["typeName"] = task_type_name
+
+            task_details["goal"] = value_map.get(self.goal_key)
+
+            #############################
+            ## Task's planet specifics ##
+            ## ======================= ##
+
+            target_info = self._resolve_task_details_by_type(task_type_name, value_map, values)
+
+            task_details["targetName"] = target_info["name"]
+            task_details["targetPlanetId"] = target_info.get("planet_id")
+            
+            if order_progress and i < len(order_progress):
+                task_details["progress"] = order_progress[i]
+            else:
+                task_details["progress"] = 0
+
+            parsed_tasks.append(task_details)
+
+        order_data["tasks"] = parsed_tasks
+
+        # Reward Parsing
+        rewards_list = order_setting.get("rewards", [])
+        if rewards_list and len(rewards_list) > 0:
+            for reward in rewards_list:
+                reward_type_id = str(reward.get("type"))
+                order_data["rewardType"] = reward_type_id
+                reward_amount = str(reward.get("amount"))
+                order_data["rewardsAmount"] = reward_amount
+        else:
+            order_data["rewardsAmount"] = None
+
+        return order_data
+
+
     def _get_type_id_by_name(self, name_to_find):
-        for id, name in self.task_types_map.items():
-            if name == name_to_find:
-                return id
-        return None
+        return self.task_type_ids.get(name_to_find)
 
         
     def _resolve_task_details_by_type(self, task_type_name, value_map, raw_values):
         result = {"name": "Unknown Target", "planet_id": None}
 
-        planet_key_id = self.get_value_key("locationIndex")
-        faction_key_id = self.get_value_key("faction")
-        target_key_id = self.get_value_key("targetID")
-        loc_type_key_id = self.get_value_key("locationType")
-
-        planet_id = value_map.get(planet_key_id)
-        faction_id = value_map.get(faction_key_id)
-        target_id = value_map.get(target_key_id)
-        loc_type_id = value_map.get(loc_type_key_id)
+        planet_id = value_map.get(self.planet_key)
+        faction_id = value_map.get(self.faction_key)
+        target_id = value_map.get(self.target_key)
+        loc_type_id = value_map.get(self.loc_type_key)
 
         planet_name = self.planet_parser.get_planet_name_by_id(planet_id) if planet_id else None # If planet_id exists, then collect its respective name
         
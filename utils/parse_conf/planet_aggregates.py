@@ -0,0 +1,87 @@
+from array import array
+from typing import Any, Dict, Optional
+
+# Numeric planet fields kept as columns
+NUMERIC_FIELDS = (
+    "bugKills", "botKills", "squidKills", "deaths", "friendlies",
+    "bulletsFired", "bulletsHit", "missionsWon", "missionsLost",
+    "missionTime", "timePlayed", "players", "currentHealth", "maxHealth",
+)
+
+# group_by name -> planet field
+GROUP_FIELDS = {
+    "sector": "sector",
+    "owner": "owner",
+    "faction": "attackingFaction", # Enemy faction of the planet's active campaign
+}
+
+
+class PlanetStatsTable():
+    """
+        Struct-of-arrays view of the numeric planet statistics, rebuilt
+        with each snapshot. Group membership is resolved once at build
+        time, and aggregates are computed once per snapshot on first use.
+    """
+
+    def __init__(self, planets: Dict[int, Dict[str, Any]]):
+        rows = list(planets.values())
+        self.size = len(rows)
+
+        self.columns: Dict[str, array] = {
+            field: array("d", (_as_float(planet.get(field)) for planet in rows))
+            for field in NUMERIC_FIELDS
+        }
+
+        # group_by -> group key -> positions of its planets in the columns
+        self.groups: Dict[str, Dict[str, array]] = {}
+        for group_by, field in GROUP_FIELDS.items():
+            members: Dict[str, array] = {}
+            for position, planet in enumerate(rows):
+                key = str(planet.get(field) or "None")
+                members.setdefault(key, array("l")).append(position)
+            self.groups[group_by] = members
+
+        self._cache: Dict[Optional[str], Dict[str, Any]] = {}
+
+
+    def aggregate(self, group_by: Optional[str] = None) -> Dict[str, Any]:
+        # group_by=None gives galaxy-wide totals
+        if group_by in self._cache:
+            return self._cache[group_by]
+
+        if group_by is None:
+            result = _summarize({field: sum(column) for field, column in self.columns.items()}, self.size)
+        elif group_by in self.groups:
+            result = {}
+            for key, positions in self.groups[group_by].items():
+                totals = {
+                    field: sum(map(column.__getitem__, positions))
+                    for field, column in self.columns.items()
+                }
+                result[key] = _summarize(totals, len(positions))
+        else:
+            raise ValueError(f"Unknown group_by '{group_by}', expected one of {list(self.groups)}")
+
+        self._cache[group_by] = result
+        return result
+
+
+def _summarize(totals: Dict[str, float], planet_count: int) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {field: int(value) if value.is_integer() else value for field, value in totals.items()}
+    summary["planets"] = planet_count
+
+    kills = totals["bugKills"] + totals["botKills"] + totals["squidKills"]
+    missions = totals["missionsWon"] + totals["missionsLost"]
+
+    summary["totalKills"] = int(kills)
+    summary["kdRatio"] = kills / totals["deaths"] if totals["deaths"] else None
+    summary["accuracy"] = (totals["bulletsFired"] / totals["bulletsHit"]) * 100 if totals["bulletsHit"] else None # Stats in API are incorrectly named
+    summary["missionsWonPercent"] = (totals["missionsWon"] / missions) * 100 if missions else None
+    return summary
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
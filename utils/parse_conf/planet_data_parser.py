@@ -1,11 +1,25 @@
 from typing import Dict, Any, Union, List
-from utils.parse_conf.data_fetcher import fetch_data_from_url
+import asyncio
+import dataclasses
+import gzip
+import hashlib
+import threading
+import time
+from utils.parse_conf import json_codec
+from utils.parse_conf.data_fetcher import fetch_many, async_fetch_many, fetch_with_stream, async_fetch_with_stream, get_payload_hash
+from utils.parse_conf.planet_name_index import PlanetNameIndex
+from utils.parse_conf.planet_aggregates import PlanetStatsTable
+from utils.parse_conf.supply_lines import SupplyLineGraph, SUPER_EARTH_INDEX
+from utils.parse_conf.planet_records import PlanetRecord, PlanetStatic, _intern
+from utils.parse_conf.planet_static_table import PlanetStaticTable
+from utils.parse_conf.planet_snapshot import PlanetSnapshot
 from conf import settings
 import traceback
 
 PLANET_URL: str = settings.urls.get("planets")  # General planet data
 PLANET_EVENTS_URL: str = settings.urls.get("planet_events")  # Planets with defence campaigns
 CAMPAIGNS_URL: str = settings.urls.get("campaigns") # Planets with liberation campaigns
+SOURCE_URLS = (PLANET_URL, PLANET_EVENTS_URL, CAMPAIGNS_URL)
 
 class PlanetParser():
     """
@@ -14,45 +28,237 @@ class PlanetParser():
     """
     
     # 
-    def __init__(self, static_json_planets, static_json_planet_effects, static_json_biomes, static_json_environmentals, static_json_factions, static_json_campaign_types):
-        self.combined_data: Dict[int, Dict[str, Any]] = {} # Return for better understanding
-
-        # static data stored
-        self.static_json_planets=static_json_planets
-        self.static_json_planet_effects = static_json_planet_effects # planet effect events (rupture strain, eagle storm, etc.)
-        self.static_json_biomes = static_json_biomes
-        self.static_json_environmentals = static_json_environmentals
-        self.static_json_factions = static_json_factions
-        self.static_json_campaign_types = static_json_campaign_types
-
-        self._fetch_and_combine()
-    
+    def __init__(self, static_resources, snapshot_store=None, projector=None, fetch_on_init=True):
+        # Current planets plus everything derived from them, replaced whole by each refresh.
+        # Each refresh bumps the version and records what changed in its deltas.
+        self.snapshot = PlanetSnapshot.empty()
+        self.delta_history = settings.planet_snapshots["delta_history"]
+        self._version_floor = 0 # Highest version already handed out by another process (see continue_from)
+
+        # Sector, biome and hazards per planet, joined once; refreshes only merge the live fields on top.
+        # Only these three sections of the StaticResources are read.
+        self.static_table = PlanetStaticTable(static_resources["planets"], static_resources["biomes"], static_resources["environmentals"])
+
+        self._refresh_lock = threading.Lock() # Stops two refreshes from overlapping
+
+        # What the current snapshot was built from: skips identical payloads, and lets
+        # unchanged planets keep their record instead of being rebuilt
+        self._payload_hashes = None
+        self._planet_digests: Dict[bytes, int] = {} # Hash of each planet's raw upstream entry -> its index
+
+        # Optional CampaignProjector; adds a 'projection' to campaign planets each refresh
+        self.projector = projector
+
+        # Warm start from the last snapshot on disk; live data follows from refresh()
+        self.snapshot_store = snapshot_store
+        if self.snapshot_store:
+            self._load_snapshot()
+
+        if fetch_on_init:
+            self.refresh()
+
+
+    # Read-only views of the current snapshot. Anything reading more than one
+    # of these should take self.snapshot once instead, so they all match.
+    @property
+    def combined_data(self) -> Dict[int, PlanetRecord]:
+        return self.snapshot.planets
 
-    def _fetch_and_combine(self):
-        # Creates one dictionary from API endpoints
-        planets_list = fetch_data_from_url(PLANET_URL) # All planets
-        planet_events_list = fetch_data_from_url(PLANET_EVENTS_URL) # Defense campaigns
-        campaigns_list = fetch_data_from_url(CAMPAIGNS_URL) # Liberation Campaigns
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    @property
+    def planets_json(self) -> bytes:
+        return self.snapshot.planets_json
+
+    @property
+    def planets_json_gzip(self) -> bytes:
+        return self.snapshot.planets_json_gzip
+
+
+    def _load_snapshot(self):
+        stored = self.snapshot_store.load("planets")
+        if not isinstance(stored, dict) or not stored:
+            return
 
         try:
-            #############
-            # LIVE DATA #
-            #############
+            self._publish({int(index): PlanetRecord.from_dict(planet) for index, planet in stored.items()}) # JSON keys come back as strings
+        except (ValueError, TypeError) as e:
+            print(f"Ignoring unreadable planet snapshot: {e}")
+
+
+    def refresh(self):
+        started = time.monotonic()
+        if settings.http_client["stream_planets"]:
+            # All three requests go out together. The planets list is parsed element by element
+            # while it downloads, never held whole in memory; only that parsing waits for the
+            # two small campaign lists it needs first.
+            responses, planets = fetch_with_stream((PLANET_EVENTS_URL, CAMPAIGNS_URL), PLANET_URL)
+        else:
+            # All three endpoints are fetched concurrently
+            responses = fetch_many(SOURCE_URLS)
+            planets = responses.get(PLANET_URL)
+        return self._apply_responses(planets, responses.get(PLANET_EVENTS_URL), responses.get(CAMPAIGNS_URL), started)
+
+
+    async def refresh_async(self):
+        started = time.monotonic()
+        if settings.http_client["stream_planets"]:
+            # Same as refresh(): the campaign lists come in on the loop while the planets stream opens
+            # alongside them. Reading the stream blocks, so it happens in the worker thread below.
+            responses, planets = await async_fetch_with_stream((PLANET_EVENTS_URL, CAMPAIGNS_URL), PLANET_URL)
+            return await asyncio.to_thread(
+                self._apply_responses, planets, responses.get(PLANET_EVENTS_URL), responses.get(CAMPAIGNS_URL), started
+            )
+
+        responses = await async_fetch_many(SOURCE_URLS)
+        # Parsing and serializing is CPU work; keep it off the event loop
+        return await asyncio.to_thread(
+            self._apply_responses, responses.get(PLANET_URL), responses.get(PLANET_EVENTS_URL), responses.get(CAMPAIGNS_URL), started
+        )
+
+
+    def _apply_responses(self, planets, planet_events_list, campaigns_list, started: float = None):
+        # Builds the new snapshot off to the side, then swaps it in with one assignment
+        # so readers never see a half-built dict. A failed build keeps the old snapshot.
+        with self._refresh_lock:
+            # A campaign list that failed or missed the deadline would publish every campaign
+            # from it as gone. Keep the current snapshot until both lists come back.
+            if not isinstance(planet_events_list, list) or not isinstance(campaigns_list, list):
+                print("Error: Campaign data unavailable; keeping the current planet snapshot.")
+                if hasattr(planets, "close"):
+                    planets.close() # Streamed planets list: release the connection unread
+                return self.combined_data
+
+            # Byte-identical to what the current snapshot was built from: nothing to do.
+            # A streamed planets list only has its hash up front when it came back 304.
+            payload_hashes = self._source_hashes(started)
+            if payload_hashes is not None and payload_hashes == self._payload_hashes and self.combined_data:
+                return self.combined_data
+
+            new_data = self._combine(
+                planets, # All planets
+                planet_events_list, # Defense campaigns
+                campaigns_list, # Liberation Campaigns
+            )
+
+            # A streamed list is hashed as it's read, so check again now that it's complete
+            payload_hashes = self._source_hashes(started)
+            if payload_hashes is not None and payload_hashes == self._payload_hashes and self.combined_data:
+                return self.combined_data
+
+            if new_data:
+                if self.projector:
+                    # One pass over every campaign planet, before the snapshot is serialized
+                    for index, projection in self.projector.update(new_data).items():
+                        new_data[index].projection = projection
+                self._publish(new_data)
+                self._payload_hashes = payload_hashes
+                if self.snapshot_store:
+                    self.snapshot_store.save_bytes("planets", self.planets_json)
+        return self.combined_data
 
-            #####################
-            ## /api/v1/planets ##
-            #####################
-            planets_dict = {}
-            if isinstance(planets_list, list):
-                for planet in planets_list:
-                    try:
-                        index = planet.get("index")
-                        if index is not None:
-                            planets_dict[int(index)] = planet
-                    except (ValueError, TypeError):
-                        continue
-                            
 
+    @staticmethod
+    def _source_hashes(started: float = None):
+        # Hashes of the three payloads fetched since `started`, or None if any is missing
+        if started is None:
+            return None
+        payload_hashes = tuple(get_payload_hash(url, started) for url in SOURCE_URLS)
+        return None if None in payload_hashes else payload_hashes
+
+
+    def continue_from(self, generation: int):
+        # Leader side of a SharedSnapshot: the next refresh is numbered after the generation
+        # already published, so versions keep increasing across restarts and leader changes
+        self._version_floor = max(self._version_floor, generation)
+
+
+    def load_shared(self, generation: int, planets_json, planets_json_gzip) -> bool:
+        # Follower side of a SharedSnapshot: adopt the leader's snapshot and version.
+        # The payloads are views into the shared mapping and are served as they are.
+        with self._refresh_lock:
+            if generation == self.version:
+                return False
+            try:
+                new_data = {int(index): PlanetRecord.from_dict(planet) for index, planet in json_codec.loads(planets_json).items()}
+            except (ValueError, TypeError) as e:
+                print(f"Ignoring unreadable shared planet snapshot: {e}")
+                return False
+            self._publish(new_data, planets_json=planets_json, planets_json_gzip=planets_json_gzip, version=generation)
+            # Built from payloads this process never saw; its own next refresh starts from scratch
+            self._payload_hashes = None
+            self._planet_digests = {}
+        return True
+
+
+    def _publish(self, new_data: Dict[int, PlanetRecord], planets_json=None, planets_json_gzip=None, version: int = None):
+        # Everything derived from the snapshot is built first, then swapped in with one assignment
+        previous = self.snapshot
+
+        supply_lines = previous.supply_lines
+        if supply_lines.signature != SupplyLineGraph.signature_of(new_data):
+            supply_lines = SupplyLineGraph(new_data)
+
+        if planets_json is None:
+            planets_json = json_codec.dumps({index: planet.to_dict() for index, planet in new_data.items()}, non_str_keys=True)
+            planets_json_gzip = gzip.compress(planets_json, compresslevel=6)
+
+        changes, removed = self._diff_snapshots(previous.planets, new_data)
+        if version is None:
+            version = max(previous.version, self._version_floor) + 1
+
+        # Deltas chain one version to the next. Any jump (a new leader carrying on, a follower
+        # that missed a generation or adopted a lower one) breaks the chain, so it starts over
+        # and clients further back than this version get the full snapshot.
+        if version == previous.version + 1:
+            deltas = (previous.deltas + ((version, changes, removed),))[-self.delta_history:]
+        else:
+            deltas = ()
+
+        self.snapshot = PlanetSnapshot(
+            version=version,
+            planets=new_data,
+            name_index=PlanetNameIndex(new_data),
+            stats_table=PlanetStatsTable(new_data),
+            supply_lines=supply_lines,
+            frontline=tuple(supply_lines.frontline(new_data)),
+            planets_json=planets_json,
+            planets_json_gzip=planets_json_gzip,
+            deltas=deltas,
+        )
+
+
+    @staticmethod
+    def _diff_snapshots(old_data: Dict[int, PlanetRecord], new_data: Dict[int, PlanetRecord]):
+        # Per planet, only the fields whose values moved (health, players, owner, campaigns...)
+        changes: Dict[int, Dict[str, Any]] = {}
+        for index, planet in new_data.items():
+            old_planet = old_data.get(index)
+            if old_planet is None:
+                changes[index] = planet.to_dict()
+            elif old_planet != planet:
+                old_fields = old_planet.to_dict()
+                changes[index] = {key: value for key, value in planet.to_dict().items() if old_fields.get(key) != value}
+
+        removed = [index for index in old_data if index not in new_data]
+        return changes, removed
+    
+
+    def _combine(self, planets, planet_events_list, campaigns_list):
+        # Creates one dictionary from API endpoints. `planets` is either the decoded
+        # planets list or, when streamed, an iterator over each entry's raw bytes.
+        combined_data: Dict[int, PlanetRecord] = {}
+        previous_data = self.combined_data
+        previous_digests = self._planet_digests
+
+        planet_digests: Dict[bytes, int] = {}
+        live_names: Dict[int, str] = {} # Names in this payload, for waypoints and attackers
+        attackers: Dict[int, Any] = {} # Defended planet -> attacking planet, named once every planet is in
+        new_statics: List[int] = [] # Planets whose static part was rebuilt and still need waypoint names
+
+        try:
             ####################################
             # Defense and Liberation Campaigns #
             ####################################
@@ -81,13 +287,39 @@ class PlanetParser():
                     if campaign_index is not None:
                         campaigns_dict[int(campaign_index)] = campaign
 
-            #######################
-            # Planet Data Parsing #
-            #######################
-            
-            for index, planet in planets_dict.items():
+            #############
+            # LIVE DATA #
+            #############
+
+            #####################
+            ## /api/v1/planets ##
+            #####################
+            for element in planets if planets is not None else ():
+                index = None
                 try:
-                
+                    # Entries are recognised by a hash of their raw bytes (decoded ones are re-encoded)
+                    raw = element if isinstance(element, bytes) else json_codec.dumps(element)
+                    digest = hashlib.blake2b(raw, digest_size=16).digest()
+
+                    # Planet outside any campaign whose upstream entry hasn't changed: keep its record
+                    # without decoding the entry at all. Campaign planets are always rebuilt since
+                    # their projection moves every refresh.
+                    index = previous_digests.get(digest)
+                    previous = previous_data.get(index) if index is not None else None
+                    if (previous is not None and not previous.campaign_id and not previous.is_under_attack
+                            and index not in planet_events_dict and index not in campaigns_dict):
+                        combined_data[index] = previous
+                        planet_digests[digest] = index
+                        live_names[index] = previous.static.name
+                        continue
+
+                    planet = json_codec.loads(raw) if isinstance(element, bytes) else element
+                    index = int(planet["index"])
+                    planet_digests[digest] = index
+                    if planet.get("name"):
+                        live_names[index] = planet["name"]
+                    previous = previous_data.get(index)
+
                     # base planet statistics dictionary
                     stats_dict = planet.get("statistics", {}) # Get stats of planet
 
@@ -115,11 +347,15 @@ class PlanetParser():
                         ## Attacker details
                         attacking_list = active_defense_event.get("attacking", [])
                         attacking_planet_id = attacking_list[0] if (isinstance(attacking_list, list) and len(attacking_list) > 0) else None
-                        attacking_planet_name = self.get_planet_name_by_id(attacking_planet_id)
+                        attacking_planet_name = "N/A"
+                        if attacking_planet_id is not None:
+                            attackers[index] = attacking_planet_id # The attacker may not have been read yet
 
+                        attacking_faction_id = ""
                         attacking_faction_name = event_stats_dict.get("faction", "Unknown")
 
                         campaign_type_id = str(event_stats_dict.get("eventType", "Unknown Event Type"))
+                        campaign_type_name = "Defense"
                         campaign_count = ""
 
                         current_health = event_stats_dict.get("health")
@@ -138,6 +374,7 @@ class PlanetParser():
                         event_id = ""
                         campaign_id = str(active_liberation_campaign.get("id"))
 
+                        attacking_faction_id = ""
                         attacking_faction_name = active_liberation_campaign.get("faction", "Humans")
                         attacking_planet_name = "N/A"
 
@@ -173,139 +410,231 @@ class PlanetParser():
                         start_time_str = ""
                         end_time_str = ""
 
-                    # Biome descriptions
-                    biome_data = planet.get("biome", {})
-
-                    if isinstance(biome_data, dict):
-                        biome_name = biome_data.get("name", "Unknown Biome")
-                        biome_desc = biome_data.get("description", "No description available.")
-                    else:
-                        biome_name = "Unknown Biome"
-                        biome_desc = "No description available."
-
-                    # Checks current owner and compares to saved faction data
-                    x, y = 0, 0
-                    planet_position = str(planet.get("position", {x: 0, y: 0}))
-                    first_owner = planet.get("initialOwner", "Unknown Origin Faction")
-                    owner_id = planet.get("currentOwner", "Unknown Faction ID")
-                    regen_per_sec = str(planet.get("regenPerSecond", 0))
-
-                    # Planet Statistics (follows dict order)
-                    missions_won = stats_dict.get('missionsWon', 0)
-                    missions_lost = stats_dict.get('missionsLost', 0)
-                    mission_time = stats_dict.get('missionTime', 0)
-                    bug_kills = stats_dict.get("terminidKills", 0)
-                    bot_kills = stats_dict.get("automatonKills", 0)
-                    squid_kills = stats_dict.get("illuminateKills", 0)
-                    bullets_fired = stats_dict.get('bulletsFired', 0)
-                    bullets_hit = stats_dict.get('bulletsHit', 0)
-                    time_played = stats_dict.get('timePlayed', 0)
-                    deaths = stats_dict.get('deaths', 0)
-                    friendlies = stats_dict.get('friendlies', 0)
-
-                    player_count = stats_dict.get("playerCount", 0)
-                    is_planet_disabled: bool = planet.get("disabled")
-
-                    # Waypoints (planets with travel paths)
-                    waypoint_ids = planet.get("waypoints", [])
-                    waypoint_names = []
-                    for waypoint in waypoint_ids:
-                        name = planets_dict.get(waypoint, {}).get("name", f"Planet {waypoint}")
-                        waypoint_names.append(name)
-
-
-                    # Planet hazards
-                    hazard_names = []
-                    hazard_descr = []
-                    hazards_list = planets_dict.get("hazards", [])
-                    for hazard in hazards_list:
-                        name = hazard.get("name", "Unknown Hazard")
-                        description = hazard.get("description")
-
-                        hazard_names.append(name)
-                        hazard_descr.append(description)
-                    
+                    static = self._static_for(index, planet, previous)
+                    if previous is None or static is not previous.static:
+                        new_statics.append(index)
 
                     # Parameters
-                    self.combined_data[index] = {
-                        # Static data (planets.json)
-                        'index': index,
-                        'name': planet.get('name', 'Unknown'),
-                        'sector': planet.get('sector', 'Unknown Sector'),
-                        'type': planet.get('type', 'Unknown Type'),
-
-                        # Planet-specific data
-                        'biomeName': biome_name,
-                        'biomeDescr': biome_desc,
-
-                        # Hazards data
-                        'hazardName': hazard_names,
-                        'hazardDesc': hazard_descr,
+                    combined_data[index] = PlanetRecord(
+                        static=static,
 
                         # Campaign data
-                        'isUnderAttack': is_under_attack, # If under attack set to true
-                        'isDisabled': is_planet_disabled, # Is planet player-accessible
-
-                        'eventId': event_id,
-                        'campaignId': campaign_id,
-                        'campaignType': campaign_type_name,
-                        'campaignTypeId': campaign_type_id,
-
-                        'campaignCount': campaign_count,
-                        'attackingFactionId': attacking_faction_id,
-                        'attackingFaction': attacking_faction_name,
-                        'attackingPlanet': attacking_planet_name,
-
-                        # Statistics data
-                        'missionsWon': missions_won,
-                        'missionsLost': missions_lost,
-                        'missionTime': mission_time,
-                        'bugKills': bug_kills,
-                        'botKills': bot_kills,
-                        'squidKills': squid_kills,
-                        'bulletsFired': bullets_fired,
-                        'bulletsHit': bullets_hit,
-                        'timePlayed': time_played,
-                        'deaths': deaths,
-                        'friendlies': friendlies,
-
-                        # Dynamic data (status_url)
-                        'players': player_count,
-                        'initialOwner': first_owner,
-                        'owner': owner_id,
+                        is_under_attack=is_under_attack, # If under attack set to true
+                        is_disabled=planet.get("disabled"), # Is planet player-accessible
+
+                        event_id=event_id,
+                        campaign_id=campaign_id,
+                        campaign_type=campaign_type_name,
+                        campaign_type_id=campaign_type_id,
+
+                        campaign_count=campaign_count,
+                        attacking_faction_id=attacking_faction_id,
+                        attacking_faction=_intern(attacking_faction_name),
+                        attacking_planet=attacking_planet_name,
+
+                        # Statistics data (follows dict order)
+                        missions_won=stats_dict.get('missionsWon', 0),
+                        missions_lost=stats_dict.get('missionsLost', 0),
+                        mission_time=stats_dict.get('missionTime', 0),
+                        bug_kills=stats_dict.get("terminidKills", 0),
+                        bot_kills=stats_dict.get("automatonKills", 0),
+                        squid_kills=stats_dict.get("illuminateKills", 0),
+                        bullets_fired=stats_dict.get('bulletsFired', 0),
+                        bullets_hit=stats_dict.get('bulletsHit', 0),
+                        time_played=stats_dict.get('timePlayed', 0),
+                        deaths=stats_dict.get('deaths', 0),
+                        friendlies=stats_dict.get('friendlies', 0),
+
+                        # Dynamic data
+                        players=stats_dict.get("playerCount", 0),
+                        owner=_intern(planet.get("currentOwner", "Unknown Faction ID")),
 
                         # Health data
-                        'currentHealth': current_health,
-                        'regenPerSecond': regen_per_sec,
-                        'maxHealth': max_health,
-                        'eventStartTime': start_time_str,
-                        'eventEndTime': end_time_str,
-
-                        # Galactic Position data
-                        'position': planet_position,
-                        'waypoints': waypoint_ids,
-                        'waypointNames': waypoint_names,
-                    }
+                        current_health=current_health,
+                        regen_per_second=planet.get("regenPerSecond", 0),
+                        max_health=max_health,
+                        event_start_time=start_time_str,
+                        event_end_time=end_time_str,
+                    )
                 except Exception as inner_e:
                     print(f"Skipping planet {index} due to error: {inner_e}")
                     continue
 
+            # Names of other planets are only all known once the whole list is in
+            for index, attacking_planet_id in attackers.items():
+                combined_data[index].attacking_planet = live_names.get(attacking_planet_id, "N/A")
+            for index in new_statics:
+                static = combined_data[index].static
+                combined_data[index].static = dataclasses.replace(
+                    static, waypoint_names=tuple(_intern(self._planet_name(waypoint, live_names)) for waypoint in static.waypoints)
+                )
+
         except Exception as e:
             import traceback
-            print(f"Encountered an error in _fetch_and_combine: {e}")
+            print(f"Encountered an error in _combine: {e}")
             traceback.print_exc()
-            return 
-        
+            return None
+
+        self._planet_digests = planet_digests
+        return combined_data
+
+
+    def _static_for(self, index: int, planet: Dict[str, Any], previous: PlanetRecord = None) -> PlanetStatic:
+        # Position, waypoints and initial owner only exist in the live payload; everything
+        # else comes from the static table. The previous static part is reused as-is unless
+        # one of the live fields moved, so a normal refresh builds nothing here. A new one
+        # gets its waypoint names from _combine, once every planet's name is known.
+        position_data = planet.get("position")
+        position = (position_data.get("x", 0), position_data.get("y", 0)) if isinstance(position_data, dict) else (0, 0)
+        waypoint_ids = tuple(planet.get("waypoints") or ())
+        initial_owner = planet.get("initialOwner", "Unknown Origin Faction")
+        planet_type = planet.get('type', 'Unknown Type')
+        metadata = self.static_table.get(index)
+
+        if previous is not None:
+            static = previous.static
+            if (static.position == position and static.waypoints == waypoint_ids
+                    and static.initial_owner == initial_owner and static.type == planet_type
+                    and static.name == planet.get('name', static.name)
+                    and (metadata is None or static.sector == metadata.sector)): # Snapshots from disk may predate the table
+                return static
+        if metadata is not None:
+            name = planet.get('name') or metadata.name # Live names follow in-game renames
+            sector, biome_name, biome_descr, hazards = metadata.sector, metadata.biome_name, metadata.biome_descr, metadata.hazards
+        else:
+            # Planet missing from resources/json (e.g. newly added upstream): fall back to the live payload
+            name = planet.get('name', 'Unknown')
+            sector = planet.get('sector', 'Unknown Sector')
+            biome_data = planet.get("biome")
+            if isinstance(biome_data, dict):
+                biome_name = biome_data.get("name", "Unknown Biome")
+                biome_descr = biome_data.get("description", "No description available.")
+            else:
+                biome_name = "Unknown Biome"
+                biome_descr = "No description available."
+            hazards = [
+                (hazard.get("name", "Unknown Hazard"), hazard.get("description"))
+                for hazard in planet.get("hazards") or []
+                if isinstance(hazard, dict)
+            ]
+
+        return PlanetStatic.build(
+            index=index,
+            name=name,
+            sector=sector,
+            type=planet_type,
+            biome_name=biome_name,
+            biome_descr=biome_descr,
+            hazards=hazards,
+            position=position,
+            waypoints=waypoint_ids,
+            waypoint_names=(),
+            initial_owner=initial_owner,
+        )
+
+
+    def _planet_name(self, index: int, live_names: Dict[int, str]) -> str:
+        if live_names.get(index):
+            return live_names[index]
+        metadata = self.static_table.get(index)
+        return metadata.name if metadata else f"Planet {index}"
+
 
     def get_all_planets(self):
         return self.combined_data
 
 
+    def get_aggregates(self, group_by: str = None) -> Dict[str, Any]:
+        # Galaxy-wide totals, or per sector / owner / faction
+        return self.snapshot.stats_table.aggregate(group_by)
+
+
+    @staticmethod
+    def _planet_summary(snapshot: PlanetSnapshot, index: int, **extra) -> Dict[str, Any]:
+        planet = snapshot.planets.get(index, {})
+        return {"index": index, "name": planet.get("name", f"Planet {index}"), "owner": planet.get("owner"), **extra}
+
+
+    def get_supply_path(self, source_name: str, target_name: str):
+        # Shortest supply route between two planets, by name
+        snapshot = self.snapshot
+        source = snapshot.name_index.lookup(source_name)
+        target = snapshot.name_index.lookup(target_name)
+        if source is None or target is None:
+            return None
+
+        route = snapshot.supply_lines.path(source, target)
+        if route is None:
+            return {"hops": None, "path": []}
+        return {"hops": len(route) - 1, "path": [self._planet_summary(snapshot, index) for index in route]}
+
+
+    def get_frontline(self) -> List[Dict[str, Any]]:
+        snapshot = self.snapshot
+        return [self._planet_summary(snapshot, index) for index in snapshot.frontline]
+
+
+    def get_reachable(self, origin_name: str = None):
+        # Everything connected to the origin (Super Earth by default), nearest first
+        snapshot = self.snapshot
+        origin = snapshot.name_index.lookup(origin_name) if origin_name else SUPER_EARTH_INDEX
+        if origin is None:
+            return None
+
+        reachable = snapshot.supply_lines.reachable_from(origin)
+        return [
+            self._planet_summary(snapshot, index, hops=hops)
+            for index, hops in sorted(reachable.items(), key=lambda item: item[1])
+        ]
+
+
+    def get_changes_since(self, since: int) -> Dict[str, Any]:
+        # Merges every delta newer than `since`. Falls back to the full snapshot
+        # when the client is too far behind (or ahead, e.g. after a restart).
+        snapshot = self.snapshot
+        deltas = snapshot.deltas
+        version = snapshot.version
+        oldest_base = deltas[0][0] - 1 if deltas else version
+
+        if since == version:
+            return {"version": version, "full": False, "changes": {}, "removed": []}
+
+        if since > version or since < oldest_base:
+            return {"version": version, "full": True, "planets": {index: planet.to_dict() for index, planet in snapshot.planets.items()}}
+
+        changes: Dict[int, Dict[str, Any]] = {}
+        removed = set()
+        for delta_version, delta_changes, delta_removed in deltas:
+            if delta_version <= since:
+                continue
+            for index, fields in delta_changes.items():
+                changes.setdefault(index, {}).update(fields)
+                removed.discard(index)
+            for index in delta_removed:
+                changes.pop(index, None)
+                removed.add(index)
+
+        return {"version": version, "full": False, "changes": changes, "removed": sorted(removed)}
+
+
+    def get_all_planets_json(self, gzipped: bool = False) -> bytes:
+        # Pre-serialized snapshot; requests just hand these bytes back
+        snapshot = self.snapshot
+        return snapshot.planets_json_gzip if gzipped else snapshot.planets_json
+
+
     def get_planet_by_name(self, planet_name: str):
-        for planet in self.combined_data.values():
-            if planet.get('name', '').lower() == planet_name.lower():
-                return planet
-        return None
+        snapshot = self.snapshot
+        index = snapshot.name_index.lookup(planet_name)
+        if index is None:
+            return None
+        return snapshot.planets.get(index)
+
+
+    def search_planets(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        # Prefix matches first, then close (typo-tolerant) matches
+        snapshot = self.snapshot
+        return [snapshot.planets[index].to_dict() for index in snapshot.name_index.search(query, limit) if index in snapshot.planets]
     
 
     def get_planet_name_by_id(self, planet_id: int|str) -> str:
@@ -0,0 +1,61 @@
+import bisect
+import difflib
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+
+def normalize_planet_name(name: str) -> str:
+    # "Planet Ü 3", "planet u3" and "PLANET  Ü-3" all normalize to "planetu3"
+    if not isinstance(name, str):
+        return ""
+
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(char for char in decomposed if char.isalnum()).casefold()
+
+
+class PlanetNameIndex():
+    """
+        Normalized name -> planet index lookup, built once per snapshot
+        so single-planet requests don't scan every planet.
+    """
+
+    def __init__(self, planets: Dict[int, Dict[str, Any]]):
+        self._by_name: Dict[str, int] = {}
+
+        for index, planet in planets.items():
+            key = normalize_planet_name(planet.get("name", ""))
+            if key:
+                self._by_name.setdefault(key, index)
+
+        # Sorted keys for prefix search with bisect
+        self._sorted_names: List[str] = sorted(self._by_name)
+
+
+    def __len__(self):
+        return len(self._by_name)
+
+
+    def lookup(self, name: str) -> Optional[int]:
+        return self._by_name.get(normalize_planet_name(name))
+
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        key = normalize_planet_name(query)
+        if not key:
+            return []
+
+        # Prefix matches first (search-as-you-type)
+        matches = []
+        start = bisect.bisect_left(self._sorted_names, key)
+        for name in self._sorted_names[start:]:
+            if not name.startswith(key) or len(matches) >= limit:
+                break
+            matches.append(name)
+
+        # Then typo-tolerant matches to fill the rest
+        if len(matches) < limit:
+            for name in difflib.get_close_matches(key, self._sorted_names, n=limit, cutoff=0.6):
+                if name not in matches and len(matches) < limit:
+                    matches.append(name)
+
+        return [self._by_name[name] for name in matches]
@@ -0,0 +1,167 @@
+import datetime
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+
+class CampaignProjector():
+    """
+        Projects every active campaign from its recent health trend:
+        liberation ETA for liberation campaigns, and the chance of
+        winning before the timer runs out for defense campaigns.
+        Runs once per refresh over all campaign planets together.
+    """
+
+    def __init__(self, window_seconds: float = 3600, max_samples: int = 240, min_span_seconds: float = 60):
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self.min_span_seconds = min_span_seconds
+
+        # planet index -> (campaign key, deque of (timestamp, health))
+        self._samples: Dict[int, Tuple[str, Deque[Tuple[float, float]]]] = {}
+        self.projections: Dict[int, Dict[str, Any]] = {}
+
+
+    @staticmethod
+    def is_campaign(planet: Dict[str, Any]) -> bool:
+        return bool(planet.get("isUnderAttack") or planet.get("campaignId"))
+
+
+    @staticmethod
+    def _campaign_key(planet: Dict[str, Any]) -> str:
+        # Health scales differ between a planet's liberation and defense, so a new campaign starts a new trend
+        return f"{planet.get('campaignId')}:{planet.get('eventId')}"
+
+
+    def seed(self, planets: Dict[int, Dict[str, Any]], history: Dict[int, Iterable[Tuple[float, float]]]):
+        # Warm the trend windows from stored history so projections don't start cold after a restart
+        for index, samples in history.items():
+            planet = planets.get(index)
+            if planet and self.is_campaign(planet):
+                # Stored rows can lack a health value; update() skips those too, so the trend only sees numbers
+                samples = ((_as_float(timestamp), _as_float(health)) for timestamp, health in samples)
+                window = deque(((timestamp, health) for timestamp, health in samples if timestamp is not None and health is not None), maxlen=self.max_samples)
+                self._samples[index] = (self._campaign_key(planet), window)
+
+
+    def update(self, planets: Dict[int, Dict[str, Any]], timestamp: Optional[float] = None) -> Dict[int, Dict[str, Any]]:
+        now = timestamp or datetime.datetime.now(datetime.timezone.utc).timestamp()
+        projections: Dict[int, Dict[str, Any]] = {}
+        active = set()
+
+        for index, planet in planets.items():
+            if not self.is_campaign(planet):
+                continue
+
+            health = _as_float(planet.get("currentHealth"))
+            if health is None:
+                continue
+            active.add(index)
+
+            key = self._campaign_key(planet)
+            stored = self._samples.get(index)
+            if stored is None or stored[0] != key:
+                stored = (key, deque(maxlen=self.max_samples))
+                self._samples[index] = stored
+            window = stored[1]
+
+            window.append((now, health))
+            while window and now - window[0][0] > self.window_seconds:
+                window.popleft()
+
+            projections[index] = self._project(planet, health, window, now)
+
+        # Forget planets whose campaign ended
+        for index in list(self._samples):
+            if index not in active:
+                del self._samples[index]
+
+        self.projections = projections
+        return projections
+
+
+    def _project(self, planet: Dict[str, Any], health: float, window, now: float) -> Dict[str, Any]:
+        is_defense = bool(planet.get("isUnderAttack"))
+        rate, rate_error = _health_trend(window, self.min_span_seconds)
+
+        if rate is None:
+            # Not enough history yet: regen is the only known force on health
+            regen = _as_float(planet.get("regenPerSecond")) or 0.0
+            rate, rate_error = regen, None
+
+        projection: Dict[str, Any] = {
+            "campaignType": "defense" if is_defense else "liberation",
+            "healthRate": rate, # Health change per second; negative means progress for the Helldivers
+            "samples": len(window),
+            "etaSeconds": None,
+            "eta": None,
+            "successProbability": None,
+        }
+
+        if rate < 0:
+            eta_seconds = health / -rate
+            projection["etaSeconds"] = eta_seconds
+            projection["eta"] = _iso(now + eta_seconds)
+
+        if is_defense:
+            end_time = _parse_iso(planet.get("eventEndTime"))
+            if end_time is not None:
+                projection["successProbability"] = _defense_success_probability(health, rate, rate_error, end_time - now)
+
+        return projection
+
+
+def _health_trend(window, min_span_seconds: float):
+    # Least-squares slope of health over time, with its standard error
+    n = len(window)
+    if n < 2 or window[-1][0] - window[0][0] < min_span_seconds:
+        return None, None
+
+    mean_t = sum(t for t, _ in window) / n
+    mean_h = sum(h for _, h in window) / n
+    ss_t = sum((t - mean_t) ** 2 for t, _ in window)
+    if ss_t == 0:
+        return None, None
+
+    slope = sum((t - mean_t) * (h - mean_h) for t, h in window) / ss_t
+    if n < 3:
+        return slope, None
+
+    intercept = mean_h - slope * mean_t
+    residuals = sum((h - (intercept + slope * t)) ** 2 for t, h in window)
+    return slope, math.sqrt(residuals / (n - 2) / ss_t)
+
+
+def _defense_success_probability(health: float, rate: float, rate_error: Optional[float], seconds_left: float) -> float:
+    if health <= 0:
+        return 1.0
+    if seconds_left <= 0:
+        return 0.0
+
+    # Rate needed to reach 0 health before the timer ends, vs the rate we're seeing
+    required_rate = -health / seconds_left
+
+    # Floor the uncertainty so a perfectly straight trend doesn't claim certainty
+    error = max(rate_error or 0.0, abs(rate) * 0.1, 1e-6)
+    z = (required_rate - rate) / error
+    return 0.5 * (1 + math.erf(z / math.sqrt(2)))
+
+
+def _parse_iso(value) -> Optional[float]:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _as_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,194 @@
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+def _intern(value) -> str:
+    # Names, sectors, biomes and factions repeat across planets and refreshes; keep one copy of each
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(frozen=True, slots=True)
+class PlanetStatic():
+    """
+        Parts of a planet that (almost) never change between refreshes.
+        Shared by every snapshot until upstream actually changes them.
+    """
+    index: int
+    name: str
+    sector: str
+    type: str
+    biome_name: str
+    biome_descr: str
+    hazards: Tuple[Tuple[str, str], ...] # (name, description)
+    position: Tuple[float, float]
+    waypoints: Tuple[int, ...]
+    waypoint_names: Tuple[str, ...]
+    initial_owner: Any
+
+    @classmethod
+    def build(cls, index, name, sector, type, biome_name, biome_descr, hazards, position, waypoints, waypoint_names, initial_owner):
+        return cls(
+            index=index,
+            name=_intern(name),
+            sector=_intern(sector),
+            type=_intern(type),
+            biome_name=_intern(biome_name),
+            biome_descr=_intern(biome_descr),
+            hazards=tuple((_intern(name), _intern(descr)) for name, descr in hazards),
+            position=position,
+            waypoints=tuple(waypoints),
+            waypoint_names=tuple(_intern(name) for name in waypoint_names),
+            initial_owner=_intern(initial_owner),
+        )
+
+
+@dataclass(slots=True)
+class PlanetRecord():
+    """
+        One planet in a snapshot: a shared PlanetStatic plus the fields
+        that move every refresh, kept numeric. Supports read-only
+        dict-style access with the API's camelCase keys, and to_dict()
+        builds the JSON payload.
+    """
+    static: PlanetStatic
+
+    # Campaign data
+    is_under_attack: bool = False
+    is_disabled: Optional[bool] = None
+    event_id: str = ""
+    campaign_id: str = ""
+    campaign_type: str = ""
+    campaign_type_id: str = ""
+    campaign_count: Any = ""
+    attacking_faction_id: Any = ""
+    attacking_faction: Any = ""
+    attacking_planet: str = ""
+
+    # Statistics data
+    missions_won: int = 0
+    missions_lost: int = 0
+    mission_time: int = 0
+    bug_kills: int = 0
+    bot_kills: int = 0
+    squid_kills: int = 0
+    bullets_fired: int = 0
+    bullets_hit: int = 0
+    time_played: int = 0
+    deaths: int = 0
+    friendlies: int = 0
+
+    # Dynamic data
+    players: int = 0
+    owner: Any = None
+    current_health: Optional[int] = None
+    regen_per_second: float = 0.0
+    max_health: Optional[int] = None
+    event_start_time: str = ""
+    event_end_time: str = ""
+
+    projection: Optional[Dict[str, Any]] = None
+
+
+    def get(self, key: str, default=None):
+        getter = _GETTERS.get(key)
+        if getter is None:
+            return default
+        return getter(self)
+
+
+    def __getitem__(self, key: str):
+        getter = _GETTERS.get(key)
+        if getter is None:
+            raise KeyError(key)
+        return getter(self)
+
+
+    def __contains__(self, key: str):
+        return key in _GETTERS
+
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = {key: getter(self) for key, getter in _GETTERS.items()}
+        if self.projection is None:
+            del payload["projection"]
+        return payload
+
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlanetRecord":
+        # Rebuilds a record from its to_dict() payload (e.g. a snapshot on disk)
+        position = data.get("position")
+        if isinstance(position, dict):
+            position = (position.get("x", 0), position.get("y", 0))
+        else:
+            position = (0, 0) # Older snapshots stored position as a string
+
+        static = PlanetStatic.build(
+            index=int(data.get("index")),
+            name=data.get("name", "Unknown"),
+            sector=data.get("sector", "Unknown Sector"),
+            type=data.get("type", "Unknown Type"),
+            biome_name=data.get("biomeName", "Unknown Biome"),
+            biome_descr=data.get("biomeDescr", "No description available."),
+            hazards=zip(data.get("hazardName") or [], data.get("hazardDesc") or []),
+            position=position,
+            waypoints=data.get("waypoints") or [],
+            waypoint_names=data.get("waypointNames") or [],
+            initial_owner=data.get("initialOwner"),
+        )
+        return cls(static=static, **{
+            attribute: data[key] for key, attribute in _DYNAMIC_FIELDS.items() if key in data
+        })
+
+
+# API key -> record attribute for fields that live on the record itself
+_DYNAMIC_FIELDS = {
+    "isUnderAttack": "is_under_attack",
+    "isDisabled": "is_disabled",
+    "eventId": "event_id",
+    "campaignId": "campaign_id",
+    "campaignType": "campaign_type",
+    "campaignTypeId": "campaign_type_id",
+    "campaignCount": "campaign_count",
+    "attackingFactionId": "attacking_faction_id",
+    "attackingFaction": "attacking_faction",
+    "attackingPlanet": "attacking_planet",
+    "missionsWon": "missions_won",
+    "missionsLost": "missions_lost",
+    "missionTime": "mission_time",
+    "bugKills": "bug_kills",
+    "botKills": "bot_kills",
+    "squidKills": "squid_kills",
+    "bulletsFired": "bullets_fired",
+    "bulletsHit": "bullets_hit",
+    "timePlayed": "time_played",
+    "deaths": "deaths",
+    "friendlies": "friendlies",
+    "players": "players",
+    "owner": "owner",
+    "currentHealth": "current_health",
+    "regenPerSecond": "regen_per_second",
+    "maxHealth": "max_health",
+    "eventStartTime": "event_start_time",
+    "eventEndTime": "event_end_time",
+    "projection": "projection",
+}
+
+# API key -> getter, in payload order
+_GETTERS = {
+    "index": lambda record: record.static.index,
+    "name": lambda record: record.static.name,
+    "sector": lambda record: record.static.sector,
+    "type": lambda record: record.static.type,
+    "biomeName": lambda record: record.static.biome_name,
+    "biomeDescr": lambda record: record.static.biome_descr,
+    "hazardName": lambda record: [name for name, _ in record.static.hazards],
+    "hazardDesc": lambda record: [descr for _, descr in record.static.hazards],
+    "initialOwner": lambda record: record.static.initial_owner,
+    "position": lambda record: {"x": record.static.position[0], "y": record.static.position[1]},
+    "waypoints": lambda record: list(record.static.waypoints),
+    "waypointNames": lambda record: list(record.static.waypoint_names),
+}
+for _key, _attribute in _DYNAMIC_FIELDS.items():
+    _GETTERS[_key] = lambda record, _attribute=_attribute: getattr(record, _attribute)
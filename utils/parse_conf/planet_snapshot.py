@@ -0,0 +1,46 @@
+import gzip
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from utils.parse_conf.planet_records import PlanetRecord
+from utils.parse_conf.planet_name_index import PlanetNameIndex
+from utils.parse_conf.planet_aggregates import PlanetStatsTable
+from utils.parse_conf.supply_lines import SupplyLineGraph
+
+# (version, changed fields per planet, removed indexes)
+Delta = Tuple[int, Dict[int, Dict[str, Any]], List[int]]
+
+
+@dataclass(frozen=True)
+class PlanetSnapshot():
+    """
+        One refresh worth of planet data and everything derived from it.
+        Built off to the side and swapped in with a single assignment, so
+        a reader holding a snapshot never mixes two refreshes. Nothing in
+        it is modified after it's built.
+    """
+    version: int
+    planets: Dict[int, PlanetRecord] # Slotted records; record.to_dict() gives the API payload
+    name_index: PlanetNameIndex
+    stats_table: PlanetStatsTable # Column view of the numeric statistics
+    supply_lines: SupplyLineGraph # Rebuilt only when waypoints change
+    frontline: Tuple[int, ...]
+    planets_json: bytes # planets serialized once per refresh (a shared memoryview on followers)
+    planets_json_gzip: bytes
+    deltas: Tuple[Delta, ...] # Oldest first, versions increasing
+
+    @classmethod
+    def empty(cls) -> "PlanetSnapshot":
+        planets: Dict[int, PlanetRecord] = {}
+        planets_json = b"{}"
+        return cls(
+            version=0,
+            planets=planets,
+            name_index=PlanetNameIndex(planets),
+            stats_table=PlanetStatsTable(planets),
+            supply_lines=SupplyLineGraph(planets),
+            frontline=(),
+            planets_json=planets_json,
+            planets_json_gzip=gzip.compress(planets_json),
+            deltas=(),
+        )
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from utils.parse_conf.planet_records import _intern
+
+
+@dataclass(frozen=True, slots=True)
+class PlanetMetadata():
+    """
+        Static metadata for one planet, joined from resources/json.
+    """
+    name: str
+    sector: str
+    biome_name: str
+    biome_descr: str
+    hazards: Tuple[Tuple[str, str], ...] # (name, description)
+
+
+class PlanetStaticTable():
+    """
+        planets.json, biomes.json and environmentals.json joined once
+        at startup into a read-only table indexed by planet index, so
+        refreshes don't re-derive sector, biome and hazards from the
+        live payload every time.
+    """
+
+    def __init__(self, static_json_planets, static_json_biomes, static_json_environmentals):
+        biomes = static_json_biomes if isinstance(static_json_biomes, dict) else {}
+        environmentals = static_json_environmentals if isinstance(static_json_environmentals, dict) else {}
+
+        entries: Dict[int, PlanetMetadata] = {}
+        if isinstance(static_json_planets, dict):
+            for index, planet in static_json_planets.items():
+                try:
+                    entries[int(index)] = self._join(planet, biomes, environmentals)
+                except (ValueError, TypeError, AttributeError) as e:
+                    print(f"Skipping static planet {index}: {e}")
+
+        self._entries: Mapping[int, PlanetMetadata] = MappingProxyType(entries)
+
+
+    @staticmethod
+    def _join(planet: Dict[str, Any], biomes: Dict[str, Any], environmentals: Dict[str, Any]) -> PlanetMetadata:
+        biome = biomes.get(planet.get("biome")) or {}
+
+        hazards = []
+        for slug in planet.get("environmentals") or []:
+            environmental = environmentals.get(slug)
+            if environmental:
+                hazards.append((_intern(environmental.get("name", "Unknown Hazard")), _intern(environmental.get("description"))))
+
+        return PlanetMetadata(
+            name=_intern(planet.get("name", "Unknown")),
+            sector=_intern(planet.get("sector", "Unknown Sector")),
+            biome_name=_intern(biome.get("name", "Unknown Biome")),
+            biome_descr=_intern(biome.get("description", "No description available.")),
+            hazards=tuple(hazards),
+        )
+
+
+    def get(self, index: int) -> Optional[PlanetMetadata]:
+        return self._entries.get(index)
+
+
+    def __contains__(self, index: int):
+        return index in self._entries
+
+
+    def __len__(self):
+        return len(self._entries)
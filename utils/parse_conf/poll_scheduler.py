@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from utils.parse_conf.data_fetcher import get_payload_hash
+from conf import settings
+
+
+class AdaptivePollScheduler():
+    """
+        Picks each endpoint's poll interval from how often its payload
+        actually changes (by content hash), within per-endpoint bounds.
+        Endpoints that change often are polled about twice per change;
+        quiet ones back off towards their maximum. A token bucket
+        shared by all endpoints keeps total traffic under the upstream
+        rate limit.
+    """
+
+    def __init__(self, requests_per_minute: float = 60, burst: float = 10, growth: float = 1.5, smoothing: float = 0.3):
+        self.growth = growth # Interval multiplier after a poll that found nothing new
+        self.smoothing = smoothing # Weight of the newest change period in the running estimate
+
+        self.rate = requests_per_minute / 60 # Tokens per second
+        self.burst = burst
+        self._tokens = burst
+        self._tokens_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.endpoints: Dict[str, Dict] = {}
+
+
+    @classmethod
+    def from_settings(cls, initial_intervals: Optional[Dict[str, float]] = None) -> "AdaptivePollScheduler":
+        config = settings.poll_scheduler
+        scheduler = cls(requests_per_minute=config["requests_per_minute"], burst=config["burst"])
+        for name, endpoint in config["endpoints"].items():
+            scheduler.register(
+                name,
+                [settings.urls[url] for url in endpoint["urls"]],
+                endpoint["min_interval"],
+                endpoint["max_interval"],
+                (initial_intervals or {}).get(name),
+            )
+        return scheduler
+
+
+    def register(self, name: str, urls: Sequence[str], min_interval: float, max_interval: float, initial_interval: Optional[float] = None):
+        interval = initial_interval if initial_interval is not None else min_interval
+        self.endpoints[name] = {
+            "urls": tuple(urls),
+            "min_interval": min_interval,
+            "max_interval": max_interval,
+            "interval": min(max(interval, min_interval), max_interval),
+            "hashes": None, # Content hashes seen on the last successful poll
+            "last_change": None, # Monotonic time the payload last changed
+            "change_period": None, # Smoothed seconds between changes
+            "polls": 0,
+            "changes": 0,
+        }
+
+
+    def interval(self, name: str) -> float:
+        return self.endpoints[name]["interval"]
+
+
+    def reserve(self, name: str) -> float:
+        # Takes one token per URL the endpoint fetches and returns how long to wait
+        # before fetching. Tokens can go negative; the wait pays the debt back.
+        cost = len(self.endpoints[name]["urls"])
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._tokens_at) * self.rate)
+            self._tokens_at = now
+            self._tokens -= cost
+            return max(0.0, -self._tokens / self.rate) if self.rate > 0 else 0.0
+
+
+    def observe(self, name: str, since: float) -> float:
+        # Call after polling `name`, with the monotonic time the poll started.
+        # Returns the interval to wait before the next poll.
+        endpoint = self.endpoints[name]
+        hashes = tuple(get_payload_hash(url, since) for url in endpoint["urls"])
+        if None in hashes:
+            return endpoint["interval"] # Failed poll says nothing about the change rate; retry on the same interval
+
+        now = time.monotonic()
+        endpoint["polls"] += 1
+        if endpoint["hashes"] is not None and hashes != endpoint["hashes"]:
+            endpoint["changes"] += 1
+            if endpoint["last_change"] is not None:
+                period = now - endpoint["last_change"]
+                previous = endpoint["change_period"]
+                endpoint["change_period"] = period if previous is None else self.smoothing * period + (1 - self.smoothing) * previous
+            endpoint["last_change"] = now
+
+            # Sample about twice per change; before a period is known, go as fast as allowed
+            target = endpoint["change_period"] / 2 if endpoint["change_period"] else endpoint["min_interval"]
+        elif endpoint["hashes"] is None:
+            target = endpoint["interval"] # First poll, nothing to compare against yet
+            endpoint["last_change"] = now
+        else:
+            target = endpoint["interval"] * self.growth
+
+        endpoint["hashes"] = hashes
+        endpoint["interval"] = min(max(target, endpoint["min_interval"]), endpoint["max_interval"])
+        return endpoint["interval"]
+
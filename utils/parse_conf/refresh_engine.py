@@ -0,0 +1,94 @@
+import asyncio
+import time
+import traceback
+from typing import Callable, Dict, List, Union
+
+
+class RefreshEngine():
+    """
+        Runs refresh jobs (e.g. PlanetParser.refresh) on a fixed
+        interval in the background so API requests never wait
+        on the upstream API.
+    """
+
+    def __init__(self, default_interval: Union[int, float] = 20):
+        self.default_interval = default_interval
+        self.jobs: Dict[str, Dict] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._listeners: Dict[str, List[Callable]] = {}
+
+
+    def add_job(self, name: str, func: Callable, interval: Union[int, float, Callable[[], float], None] = None, run_immediately: bool = True):
+        # Coroutine functions are awaited on the loop; blocking functions run
+        # in a worker thread so the event loop stays free. `interval` may be a
+        # callable, asked again after every run (e.g. an adaptive poll interval).
+        self.jobs[name] = {
+            "func": func,
+            "interval": interval or self.default_interval,
+            "run_immediately": run_immediately,
+            "last_run": None,
+            "last_duration": None,
+        }
+
+
+    def add_listener(self, name: str, callback: Callable):
+        # Called on the event loop with the job's return value after every successful run
+        self._listeners.setdefault(name, []).append(callback)
+
+
+    def start(self):
+        for name in self.jobs:
+            if name not in self._tasks:
+                self._tasks[name] = asyncio.create_task(self._run_job(name), name=f"refresh:{name}")
+        print(f"Refresh engine started with {len(self._tasks)} job(s).")
+
+
+    async def stop(self):
+        for task in self._tasks.values():
+            task.cancel()
+
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        print("Refresh engine stopped.")
+
+
+    async def _run_job(self, name: str):
+        job = self.jobs[name]
+
+        if not job["run_immediately"]:
+            await asyncio.sleep(self._interval(job))
+
+        while True:
+            started = time.monotonic()
+            try:
+                if asyncio.iscoroutinefunction(job["func"]):
+                    result = await job["func"]()
+                else:
+                    result = await asyncio.to_thread(job["func"])
+                self._notify(name, result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A failed refresh keeps the previous snapshot; try again next interval
+                print(f"Refresh job '{name}' failed: {e}")
+                traceback.print_exc()
+
+            job["last_run"] = time.time()
+            job["last_duration"] = time.monotonic() - started
+
+            # Interval is measured from the start of the run, not the end
+            await asyncio.sleep(max(0, self._interval(job) - job["last_duration"]))
+
+
+    @staticmethod
+    def _interval(job) -> float:
+        interval = job["interval"]
+        return interval() if callable(interval) else interval
+
+
+    def _notify(self, name: str, result):
+        for callback in self._listeners.get(name, []):
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"Listener for refresh job '{name}' failed: {e}")
@@ -0,0 +1,57 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+
+class ResponseCache():
+    """
+        In-process cache for API responses with a TTL per key, used from
+        the event loop. Concurrent misses on the same key share a single
+        loader call, and expired entries are served immediately while
+        one background refresh runs (stale-while-revalidate).
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+
+    async def aget(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float = 0):
+        # loader is a coroutine function, awaited at most once per key at a time
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        if entry and now < entry["expires"]:
+            return entry["value"]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._aload(key, loader, ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        if entry and now < entry["expires"] + stale_ttl:
+            return entry["value"] # Refresh carries on in the background
+
+        # shield() so one cancelled request doesn't cancel the fetch other requests are waiting on
+        return await asyncio.shield(task)
+
+
+    async def _aload(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float):
+        try:
+            value = await loader()
+        except Exception as e:
+            print(f"Refresh of '{key}' failed: {e}")
+            value = None
+
+        if value is not None:
+            self.set(key, value, ttl)
+            return value
+
+        # Failed upstream fetch: fall back to the last good value if we have one
+        entry = self._entries.get(key)
+        return entry["value"] if entry else None
+
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = {"value": value, "expires": time.monotonic() + ttl}
@@ -0,0 +1,171 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.parse_conf import json_codec
+from utils.parse_conf.atomic_file import map_file, write_atomic
+
+try:
+    import fcntl
+except ImportError: # Windows: no flock, every worker refreshes for itself
+    fcntl = None
+
+SNAPSHOT_MAGIC = b"AHGSSS1\n"
+_HEADER = struct.Struct("<QI") # generation, number of parts
+_PART = struct.Struct("<Q") # length of each part
+
+
+class SharedSnapshot():
+    """
+        Serialized snapshots shared between uvicorn workers through
+        memory-mapped files. One worker holds the leader lock, refreshes
+        from upstream and publishes; the others map the published file
+        and read it zero-copy, decoding at most once per generation, so
+        upstream traffic and snapshot memory don't grow with the number
+        of workers.
+    """
+
+    def __init__(self, directory: str, can_lead: bool = True):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+        # False when a dedicated poller is deployed: this process only follows
+        self.can_lead = can_lead
+        self.is_leader = False
+        self._lock_fd: Optional[int] = None
+        self._lock = threading.Lock()
+
+        # name -> (file identity, generation, mapped parts)
+        self._mapped: Dict[str, Tuple[Tuple[int, int], int, List[memoryview]]] = {}
+        # name -> (generation, decoded value)
+        self._decoded: Dict[str, Tuple[int, Any]] = {}
+
+        if fcntl is None:
+            print("File locking unavailable; this worker will refresh from upstream on its own.")
+
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.snapshot")
+
+
+    def try_lead(self) -> bool:
+        # Non-blocking flock; whoever holds it refreshes. The OS drops the lock when
+        # the leader exits, so a follower takes over on its next attempt.
+        if self.is_leader:
+            return True
+        if fcntl is None:
+            self.is_leader = True
+            return True
+        if not self.can_lead:
+            return False
+
+        fd = os.open(os.path.join(self.directory, "leader.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        self._lock_fd = fd
+        self.is_leader = True
+        print(f"Worker {os.getpid()} is now the snapshot leader.")
+        return True
+
+
+    def release(self):
+        if self._lock_fd is not None:
+            os.close(self._lock_fd) # Closing the descriptor releases the flock
+            self._lock_fd = None
+        self.is_leader = False
+
+
+    def publish(self, name: str, *parts: bytes, generation: Optional[int] = None):
+        # Written to a temp file and renamed over the old one: readers keep their
+        # existing mapping until they notice the new file, so they never see a torn write
+        if fcntl is None:
+            return
+        if generation is None:
+            generation = self.generation(name) + 1
+
+        header = [SNAPSHOT_MAGIC, _HEADER.pack(generation, len(parts))] + [_PART.pack(len(part)) for part in parts]
+        try:
+            write_atomic(self._path(name), header + list(parts))
+        except OSError as e:
+            print(f"Error publishing shared snapshot '{name}': {e}")
+
+
+    def publish_json(self, name: str, data: Any, generation: Optional[int] = None):
+        self.publish(name, json_codec.dumps(data, non_str_keys=True), generation=generation)
+
+
+    def read(self, name: str) -> Optional[Tuple[int, List[memoryview]]]:
+        # (generation, parts) of the latest published snapshot. Parts are views into the
+        # mapped file; one stat() per call decides whether it needs re-mapping.
+        try:
+            stat = os.stat(self._path(name))
+        except OSError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns)
+
+        with self._lock:
+            mapped = self._mapped.get(name)
+            if mapped is None or mapped[0] != identity:
+                mapped = self._map(name, identity)
+                if mapped is None:
+                    return None
+                self._mapped[name] = mapped
+            return mapped[1], mapped[2]
+
+
+    def _map(self, name: str, identity: Tuple[int, int]):
+        result = map_file(self._path(name), SNAPSHOT_MAGIC, self._read_header, f"shared snapshot '{name}'")
+        if result is None:
+            return None
+        mapped, (generation, lengths, position) = result
+
+        # The old mapping is left to the garbage collector: responses may still hold views into it
+        view = memoryview(mapped)
+        parts = []
+        for length in lengths:
+            parts.append(view[position:position + length])
+            position += length
+        return identity, generation, parts
+
+
+    @staticmethod
+    def _read_header(mapped: mmap.mmap, position: int) -> Tuple[int, List[int], int]:
+        # (generation, length of each part, offset of the first part)
+        generation, part_count = _HEADER.unpack_from(mapped, position)
+        position += _HEADER.size
+        lengths = [_PART.unpack_from(mapped, position + i * _PART.size)[0] for i in range(part_count)]
+        position += part_count * _PART.size
+        if position + sum(lengths) > len(mapped):
+            raise ValueError("truncated")
+        return generation, lengths, position
+
+
+    def generation(self, name: str) -> int:
+        snapshot = self.read(name)
+        return snapshot[0] if snapshot else 0
+
+
+    def load(self, name: str, decode: Callable[[memoryview], Any] = json_codec.loads) -> Optional[Any]:
+        # Decoded first part of the snapshot, cached until the generation changes
+        snapshot = self.read(name)
+        if snapshot is None:
+            return None
+        generation, parts = snapshot
+
+        cached = self._decoded.get(name)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        try:
+            value = decode(parts[0])
+        except (ValueError, IndexError) as e:
+            print(f"Error decoding shared snapshot '{name}': {e}")
+            return None
+        self._decoded[name] = (generation, value)
+        return value
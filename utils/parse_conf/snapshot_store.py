@@ -0,0 +1,50 @@
+import os
+import time
+from typing import Any, Optional
+
+from utils.parse_conf import json_codec
+from utils.parse_conf.atomic_file import write_atomic
+
+
+class SnapshotStore():
+    """
+        Keeps the last good snapshot of each dataset on disk so a
+        freshly started worker can serve data straight away and
+        refresh from upstream in the background.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+
+    def save(self, name: str, data: Any):
+        self.save_bytes(name, json_codec.dumps(data, non_str_keys=True))
+
+
+    def save_bytes(self, name: str, payload: bytes):
+        # Synced to disk before the rename, so a crash mid-write never leaves a truncated snapshot behind
+        try:
+            write_atomic(self._path(name), (payload,), fsync=True)
+        except OSError as e:
+            print(f"Error saving snapshot '{name}': {e}")
+
+
+    def load(self, name: str) -> Optional[Any]:
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                data = json_codec.loads(f.read())
+            age = time.time() - os.path.getmtime(path)
+            print(f"Loaded '{name}' snapshot from disk ({age:.0f}s old).")
+            return data
+        except (OSError, json_codec.JSONDecodeError) as e:
+            print(f"Error loading snapshot '{name}': {e}")
+            return None
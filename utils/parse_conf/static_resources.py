@@ -0,0 +1,194 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from utils.parse_conf import json_codec
+from utils.parse_conf.atomic_file import map_file, write_atomic
+
+# Section name -> path under resources/json
+RESOURCE_FILES = {
+    "planets": "planets/planets.json", # Planet name, sector, biome, environmentals
+    "biomes": "planets/biomes.json",
+    "environmentals": "planets/environmentals.json",
+    "planet_effects": "effects/planetEffects.json",
+    "campaign_types": "campaign_types.json",
+    "factions": "factions.json",
+    "task_types": "assignments/tasks/task/type.json", # Major Order mission types
+    "task_value_types": "assignments/tasks/task/valueTypes.json",
+    "reward_types": "assignments/reward/type.json",
+    "items": "items/item_names.json",
+}
+
+BUNDLE_MAGIC = b"AHGSRB1\n"
+_HEADER = struct.Struct("<I") # Length of the index that follows the magic
+
+
+class StaticResources():
+    """
+        Read-only access to resources/json through one preprocessed
+        bundle: every file re-encoded compactly into a single file,
+        keyed by a hash of the source contents and rebuilt only when
+        they change. The bundle is memory-mapped, so forked workers
+        share the same pages, and each section is only decoded the
+        first time it's asked for.
+    """
+
+    def __init__(self, directory: str, bundle_path: str, files: Dict[str, str] = RESOURCE_FILES):
+        self.directory = directory
+        self.bundle_path = bundle_path
+        self.files = files
+
+        self._lock = threading.Lock()
+        self._decoded: Dict[str, Any] = {}
+        self._sections: Dict[str, Tuple[int, int]] = {} # name -> (offset, length) in the mapped bundle
+        self._mmap: Optional[mmap.mmap] = None
+        self._open()
+
+
+    def _open(self):
+        stats = self._source_stats()
+        index = self._map_bundle()
+
+        # Fast path: sources untouched since the bundle was built, nothing to read or hash
+        if index and index.get("stats") == stats:
+            return
+
+        sources = self._read_sources()
+        content_hash = self._content_hash(sources)
+        if index and index.get("hash") == content_hash:
+            # Files were touched but not changed: keep the encoded sections, just record the new stats
+            sections = {name: self._mmap[offset:offset + length] for name, (offset, length) in self._sections.items()}
+        else:
+            print("Building static resource bundle...")
+            sections = {name: self._reencode(name, raw) for name, raw in sources.items()}
+
+        if self._write_bundle(content_hash, stats, sections) and self._map_bundle():
+            return
+
+        # Bundle couldn't be written (e.g. read-only filesystem): serve the sources from memory
+        self._close_mmap()
+        self._decoded = {name: json_codec.loads(payload) for name, payload in sections.items()}
+
+
+    def _source_stats(self) -> Dict[str, Any]:
+        stats = {}
+        for name, relative_path in self.files.items():
+            try:
+                stat = os.stat(os.path.join(self.directory, relative_path))
+                stats[name] = [stat.st_size, stat.st_mtime_ns]
+            except OSError:
+                stats[name] = None
+        return stats
+
+
+    def _read_sources(self) -> Dict[str, Optional[bytes]]:
+        sources = {}
+        for name, relative_path in self.files.items():
+            full_path = os.path.join(self.directory, relative_path)
+            try:
+                with open(full_path, "rb") as f:
+                    sources[name] = f.read()
+            except OSError:
+                print(f"Warning: Static JSON file not found at {full_path}")
+                sources[name] = None
+        return sources
+
+
+    @staticmethod
+    def _content_hash(sources: Dict[str, Optional[bytes]]) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for name in sorted(sources):
+            raw = sources[name]
+            digest.update(name.encode())
+            digest.update(b"\0" if raw is None else struct.pack("<Q", len(raw)) + raw)
+        return digest.hexdigest()
+
+
+    def _reencode(self, name: str, raw: Optional[bytes]) -> bytes:
+        # Compact form of the file; unreadable files become an empty section
+        if raw is None:
+            return b"{}"
+        try:
+            return json_codec.dumps(json_codec.loads(raw))
+        except json_codec.JSONDecodeError as e:
+            print(f"Error loading {os.path.join(self.directory, self.files[name])}: {e}")
+            return b"{}"
+
+
+    def _write_bundle(self, content_hash: str, stats: Dict[str, Any], sections: Dict[str, bytes]) -> bool:
+        offset = 0
+        layout = {}
+        for name, payload in sections.items():
+            layout[name] = [offset, len(payload)]
+            offset += len(payload)
+        index = json_codec.dumps({"hash": content_hash, "stats": stats, "sections": layout})
+
+        # Written whole and renamed into place, so workers starting together never map a half-written bundle
+        try:
+            write_atomic(self.bundle_path, [BUNDLE_MAGIC, _HEADER.pack(len(index)), index, *sections.values()])
+            return True
+        except OSError as e:
+            print(f"Error writing static resource bundle: {e}")
+            return False
+
+
+    def _map_bundle(self) -> Optional[Dict[str, Any]]:
+        # Maps the bundle and reads its index; None if it's missing or unreadable
+        self._close_mmap()
+        result = map_file(self.bundle_path, BUNDLE_MAGIC, self._read_index, "static resource bundle")
+        if result is None:
+            return None
+        mapped, (index, sections) = result
+
+        self._mmap = mapped
+        self._sections = sections
+        self._decoded = {}
+        return index
+
+
+    def _read_index(self, mapped: mmap.mmap, position: int) -> Tuple[Dict[str, Any], Dict[str, Tuple[int, int]]]:
+        # The bundle's index, and each section's (offset, length) in the mapping
+        (index_length,) = _HEADER.unpack_from(mapped, position)
+        start = position + _HEADER.size
+        index = json_codec.loads(mapped[start:start + index_length]) # JSONDecodeError is a ValueError
+        body = start + index_length
+        sections = {name: (body + offset, length) for name, (offset, length) in index["sections"].items()}
+        if set(sections) != set(self.files) or any(offset + length > len(mapped) for offset, length in sections.values()):
+            raise ValueError("sections don't match")
+        return index, sections
+
+
+    def _close_mmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = None
+        self._sections = {}
+
+
+    def __getitem__(self, name: str) -> Any:
+        decoded = self._decoded.get(name)
+        if decoded is not None:
+            return decoded
+
+        with self._lock:
+            if name not in self._decoded:
+                if name not in self._sections:
+                    raise KeyError(name)
+                offset, length = self._sections[name]
+                self._decoded[name] = json_codec.loads(self._mmap[offset:offset + length])
+            return self._decoded[name]
+
+
+    def get(self, name: str, default=None) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+
+    def close(self):
+        with self._lock:
+            self._close_mmap()
@@ -0,0 +1,120 @@
+from array import array
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+SUPER_EARTH_INDEX = 0
+HUMAN_OWNERS = ("Humans", 1)
+
+
+class SupplyLineGraph():
+    """
+        Supply lines (planet waypoints) as a compact CSR adjacency.
+        All-pairs hop distances and shortest-path predecessors are
+        computed once per waypoint layout, so graph queries never walk
+        dicts per request.
+    """
+
+    def __init__(self, planets: Dict[int, Dict[str, Any]]):
+        self.signature = self.signature_of(planets)
+
+        # Planet index <-> dense node id
+        self.nodes: List[int] = sorted(planets)
+        self.node_of: Dict[int, int] = {index: node for node, index in enumerate(self.nodes)}
+        n = len(self.nodes)
+        self.size = n
+
+        # Supply lines can be travelled both ways, even if upstream only lists one direction
+        neighbours: List[set] = [set() for _ in range(n)]
+        for index, planet in planets.items():
+            node = self.node_of[index]
+            for waypoint in planet.get("waypoints") or []:
+                other = self.node_of.get(waypoint)
+                if other is not None and other != node:
+                    neighbours[node].add(other)
+                    neighbours[other].add(node)
+
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+        for node in range(n):
+            self.indices.extend(sorted(neighbours[node]))
+            self.indptr.append(len(self.indices))
+
+        self.distances, self.predecessors = self._all_pairs_bfs()
+
+
+    @staticmethod
+    def signature_of(planets: Dict[int, Dict[str, Any]]) -> int:
+        # Cheap fingerprint of the waypoint layout; the graph is only rebuilt when it changes
+        return hash(tuple((index, tuple(planets[index].get("waypoints") or ())) for index in sorted(planets)))
+
+
+    def _neighbours(self, node: int):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+
+    def _all_pairs_bfs(self) -> Tuple[array, array]:
+        # Row-major n*n tables: hop count (-1 = unreachable) and the previous node on a shortest path
+        n = self.size
+        distances = array("h", [-1]) * (n * n)
+        predecessors = array("h", [-1]) * (n * n)
+
+        for source in range(n):
+            row = source * n
+            distances[row + source] = 0
+            queue = deque([source])
+            while queue:
+                node = queue.popleft()
+                next_hop = distances[row + node] + 1
+                for neighbour in self._neighbours(node):
+                    if distances[row + neighbour] == -1:
+                        distances[row + neighbour] = next_hop
+                        predecessors[row + neighbour] = node
+                        queue.append(neighbour)
+
+        return distances, predecessors
+
+
+    def hops(self, source: int, target: int) -> Optional[int]:
+        if source not in self.node_of or target not in self.node_of:
+            return None
+        distance = self.distances[self.node_of[source] * self.size + self.node_of[target]]
+        return distance if distance >= 0 else None
+
+
+    def path(self, source: int, target: int) -> Optional[List[int]]:
+        # Planet indexes from source to target along a shortest supply route
+        if self.hops(source, target) is None:
+            return None
+
+        row = self.node_of[source] * self.size
+        node = self.node_of[target]
+        source_node = self.node_of[source]
+        route = [node]
+        while node != source_node:
+            node = self.predecessors[row + node]
+            route.append(node)
+
+        return [self.nodes[node] for node in reversed(route)]
+
+
+    def reachable_from(self, source: int) -> Dict[int, int]:
+        # Planet index -> hop count for everything connected to source
+        if source not in self.node_of:
+            return {}
+        row = self.node_of[source] * self.size
+        return {
+            self.nodes[node]: self.distances[row + node]
+            for node in range(self.size)
+            if self.distances[row + node] >= 0
+        }
+
+
+    def frontline(self, planets: Dict[int, Dict[str, Any]]) -> List[int]:
+        # Human-held planets with a supply line into enemy territory. Depends on owners,
+        # so it's computed per snapshot, but it's a single pass over the CSR arrays.
+        human = array("b", (planets.get(index, {}).get("owner") in HUMAN_OWNERS for index in self.nodes))
+        return [
+            self.nodes[node]
+            for node in range(self.size)
+            if human[node] and any(not human[neighbour] for neighbour in self._neighbours(node))
+        ]